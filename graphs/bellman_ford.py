@@ -1,48 +1,188 @@
+from collections import deque
 
+import numpy as np
 
-def bellman_ford(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[int]:
+from csr_graph import CSRGraph, edges_of
+from graph_loader import read_graph
+
+
+class NegativeCycleError(Exception):
     """
-    n: number of vertices 
-    source: source vertex
-    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
-    return: a list prev[] where prev[u] indicates what's the previous vertex on the optimal path from source to u
-    
-    runs dynamic programming to find the shortest path from the source (s) to all other vertices
+    raised when a negative cycle is reachable from the source, so the shortest distances are not defined
+    cycle: the vertices of one such cycle, in the order of its edges (cycle[-1] -> cycle[0] closes it)
+    """
+
+    def __init__(self, cycle: list[int]):
+        super().__init__(f'negative cycle reachable from the source: {cycle}')
+        self.cycle = cycle
+
+
+def find_cycle(n: int, prev, start: int) -> list[int]:
+    """
+    start: a vertex that was relaxed after n - 1 rounds, so going back n times through prev lands on a cycle
+    return: the vertices of that cycle (the cycles of prev are always negative)
+    """
+    v = start
+    for _ in range(n):
+        v = prev[v]
+    cycle = [v]
+    u = prev[v]
+    while u != v:
+        cycle.append(u)
+        u = prev[u]
+    cycle.reverse() # prev goes backwards, so reverse it to follow the edges
+    return [int(u) for u in cycle]
+
+
+def relaxation_rounds(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph) -> tuple[list[int], list[int]]:
+    """
+    the classic algorithm: relax every edge, round after round,
+    but it stops as soon as a round doesn't change any distance
     """
-    
     distance = [float("inf") for _ in range(n)]
     distance[source] = 0
-    
+
     prev = [None for _ in range(n)]
-    
-    for k in range(n - 1):
+    out = edges_of(adj_list)
+
+    for k in range(n):
+        last_relaxed = None
         for v in range(n):
-            for u, w in adj_list[v]:
-                # there is an edge from v to u with weight w 
+            if distance[v] == float("inf"): # no edge from v can relax anything yet
+                continue
+            for u, w in out(v):
+                # there is an edge from v to u with weight w
                 if distance[u] > distance[v] + w:
-                    distance[u] = distance[v] + w 
-                    prev[u] = v 
-    
+                    distance[u] = distance[v] + w
+                    prev[u] = v
+                    last_relaxed = u
+        if last_relaxed is None: # nothing changed, so nothing will change in the next rounds either
+            break
+        if k == n - 1: # after n - 1 rounds every shortest path is found, unless there is a negative cycle
+            raise NegativeCycleError(find_cycle(n, prev, last_relaxed))
+    return distance, prev
+
+
+def spfa(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph) -> tuple[list[int], list[int]]:
+    """
+    queue-based Bellman-Ford (shortest path faster algorithm):
+    only the out-edges of vertices whose distance changed are scanned again
+
+    length[u] is the number of edges of the current path to u; a simple path has at most n - 1 edges,
+    so reaching n edges means the path goes around a negative cycle
+    """
+    distance = [float("inf") for _ in range(n)]
+    distance[source] = 0
+    prev = [None for _ in range(n)]
+    length = [0 for _ in range(n)]
+    in_queue = [False for _ in range(n)]
+    out = edges_of(adj_list)
+
+    Q = deque([source])
+    in_queue[source] = True
+    while len(Q) > 0:
+        v = Q.popleft()
+        in_queue[v] = False
+        for u, w in out(v):
+            if distance[u] > distance[v] + w:
+                distance[u] = distance[v] + w
+                prev[u] = v
+                length[u] = length[v] + 1
+                if length[u] >= n:
+                    raise NegativeCycleError(find_cycle(n, prev, u))
+                if not in_queue[u]:
+                    Q.append(u)
+                    in_queue[u] = True
+    return distance, prev
+
+
+def bellman_ford_arrays(n: int, source: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    n: number of vertices
+    source: source vertex
+    sources, targets, weights: the i-th edge goes from sources[i] to targets[i] with weight weights[i]
+    return: (distance, prev) as arrays, distance is float64 (inf if unreachable) and prev is -1 where undefined
+
+    every round relaxes all the edges at once with NumPy, using the distances of the previous round
+    """
+    distance = np.full(n, np.inf)
+    distance[source] = 0
+    prev = np.full(n, -1, dtype=np.int64)
+    weights = weights.astype(np.float64)
+
+    for k in range(n):
+        candidate = distance[sources] + weights # the distance through every edge
+        new_distance = distance.copy()
+        np.minimum.at(new_distance, targets, candidate)
+        improved = new_distance < distance
+        if not improved.any():
+            break
+        # for every improved vertex, take (any) edge that achieves its new distance
+        best_edges = np.flatnonzero(improved[targets] & (candidate == new_distance[targets]))
+        prev[targets[best_edges]] = sources[best_edges]
+        distance = new_distance
+        if k == n - 1:
+            raise NegativeCycleError(find_cycle(n, prev, int(np.flatnonzero(improved)[0])))
+    return distance, prev
+
+
+def shortest_paths(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, method: str = "rounds") -> tuple[list[int], list[int]]:
+    """
+    n: number of vertices
+    source: source vertex
+    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
+    method: "rounds" (relax every edge until nothing changes), "spfa" (queue-based) or "numpy" (vectorized rounds)
+    return: (distance, prev), where distance[u] is the length of the shortest path from source to u
+        and prev[u] indicates what's the previous vertex on the optimal path from source to u
+
+    raises NegativeCycleError (with a witness cycle) if a negative cycle is reachable from the source
+    """
+    if method == "rounds":
+        return relaxation_rounds(n, source, adj_list)
+    if method == "spfa":
+        return spfa(n, source, adj_list)
+    if method == "numpy":
+        if not isinstance(adj_list, CSRGraph):
+            adj_list = CSRGraph.from_adj_list(adj_list)
+        sources, targets, weights = adj_list.edge_arrays()
+        if weights is None: # an unweighted graph (or one without edges): every edge weighs 1
+            weights = np.ones(len(targets), dtype=np.int64)
+        distance, prev = bellman_ford_arrays(n, source, sources, targets, weights)
+        if np.issubdtype(weights.dtype, np.integer):
+            distance = [d if d == np.inf else int(d) for d in distance.tolist()]
+        else:
+            distance = distance.tolist()
+        prev = [None if p == -1 else p for p in prev.tolist()]
+        return distance, prev
+    raise ValueError(f'unknown method {method}')
+
+
+def bellman_ford(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, method: str = "rounds") -> list[int]:
+    """
+    n: number of vertices
+    source: source vertex
+    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
+    return: a list prev[] where prev[u] indicates what's the previous vertex on the optimal path from source to u
+
+    runs dynamic programming to find the shortest path from the source (s) to all other vertices
+    (see shortest_paths for the methods)
+    """
+    distance, prev = shortest_paths(n, source, adj_list, method)
     print(distance)
     return prev
 
 def main():
-    n, m = map(int, input().split()) # num of vertices and edges respectively
-    # assume that the vertices are labeled from 0 to n - 1
-    adj_list = [[] for _ in range(n)] # initially, each vertex has 0 neighbors
-    
-    # read the edges (directed edges)
-    for _ in range(m):
-        u, v, w = map(int, input().split()) # a directed edge u -> v with weight = w
-        adj_list[u].append((v, w)) # v is a neighbor of u and the edge has weight w 
-    
-    prev = bellman_ford(n, 0, adj_list)
-    print(prev)
-    
-    
-    
+    # input: "n m" (num of vertices and edges respectively), then m lines "u v w",
+    # a directed edge u -> v with weight = w. The vertices are labeled from 0 to n - 1
+    adj_list = read_graph(weighted=True) # read in one go, straight into a CSRGraph
+    n = adj_list.n
 
-if __name__ == '__main__':
-    main()
+    try:
+        prev = bellman_ford(n, 0, adj_list)
+        print(prev)
+    except NegativeCycleError as error:
+        print("negative cycle:", error.cycle)
 
 
+if __name__ == '__main__':
+    main()
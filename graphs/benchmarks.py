@@ -0,0 +1,742 @@
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+import bfs as bfs_module
+import bellman_ford
+import bipartite_check
+import counting_rooms
+from csr_graph import CSRGraph, edges_of
+from dfs_engine import DepthFirstSearch
+from dijkstra_heap import shortest_paths
+from dynamic_shortest_paths import DynamicShortestPaths
+from disjoint_sets import DisjointSets
+from floyd_warshall import floyd_warshall
+from graph_loader import load_binary, read_graph, save_binary
+from grid_search import Grid, astar, bfs, count_rooms
+from johnson import johnson
+from kruskal import kruskal
+from mst import boruvka_arrays, dense_cutover, kruskal_arrays, prim_arrays
+from room_labeling import count_rooms_streaming, label_rooms
+from shortest_path_query import reversed_graph, shortest_path
+from strong_components import ReachabilityIndex, strongly_connected_components
+from topological_order import IncrementalTopologicalOrder, topological_levels
+from tree_index import TreeIndex
+
+
+def random_edges(n: int, m: int, seed: int = 0, max_weight: int = 100) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    returns m random directed edges (a, b, w) over n vertices, as three arrays
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, n, size=m)
+    b = rng.integers(0, n, size=m)
+    w = rng.integers(1, max_weight + 1, size=m)
+    return a, b, w
+
+
+def measure(build):
+    """
+    runs build() and returns (result, seconds, memory retained by the result in bytes, peak memory in bytes)
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    result = build()
+    elapsed = perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, retained, peak
+
+
+def queue_bfs(adj_list, source: int) -> list[int | None]:
+    """
+    the textbook breadth-first search with a deque, one vertex at a time (the baseline of the vectorized ones)
+    return: distance[], None for the unreachable vertices
+    """
+    out = edges_of(adj_list)
+    distance = [None] * len(adj_list)
+    distance[source] = 0
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for neighbour in out(node):
+            if distance[neighbour] is None:
+                distance[neighbour] = distance[node] + 1
+                queue.append(neighbour)
+    return distance
+
+
+def benchmark_csr(n: int = 10**5, m: int = 10**6):
+    """
+    memory and BFS traversal time of the list-of-lists adj_list vs the CSRGraph
+    """
+    a, b, _ = random_edges(n, m)
+
+    def build_adj_list():
+        adj_list = [[] for _ in range(n)]
+        for u, v in zip(a.tolist(), b.tolist()):
+            adj_list[u].append(v)
+            adj_list[v].append(u)
+        return adj_list
+
+    def build_csr():
+        return CSRGraph.from_edges(n, a, b, directed=False)
+
+    def traverse(graph):
+        queue_bfs(graph, 0)
+
+    print(f"csr: n = {n}, m = {m} (undirected)")
+    for name, build in [("adj_list", build_adj_list), ("CSRGraph", build_csr)]:
+        graph, build_time, retained, peak = measure(build)
+        start = perf_counter()
+        traverse(graph)
+        bfs_time = perf_counter() - start
+        print(f"{name:>10}: build {build_time * 1000:9.1f} ms, memory {retained / 2**20:8.1f} MiB (peak {peak / 2**20:8.1f} MiB), bfs {bfs_time * 1000:9.1f} ms")
+
+
+def benchmark_loader(n: int = 10**5, m: int = 10**6):
+    """
+    load time of a weighted edge list: input() per line vs bulk text parsing vs memory-mapped binary files
+    """
+    a, b, w = random_edges(n, m)
+    lines = [f"{n} {m}"] + [f"{u} {v} {weight}" for u, v, weight in zip(a.tolist(), b.tolist(), w.tolist())]
+    text = "\n".join(lines) + "\n"
+
+    def per_line():
+        # what every main() used to do
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(text)
+        try:
+            n_nodes, n_edges = map(int, input().split())
+            adj_list = [[] for _ in range(n_nodes)]
+            for _ in range(n_edges):
+                u, v, weight = map(int, input().split())
+                adj_list[u].append((v, weight))
+        finally:
+            sys.stdin = stdin
+        return adj_list
+
+    def bulk_text():
+        return read_graph(io.BytesIO(text.encode()), weighted=True)
+
+    print(f"loader: n = {n}, m = {m} (weighted)")
+    with tempfile.TemporaryDirectory() as directory:
+        raw_path = os.path.join(directory, "edges.bin")
+        npy_path = os.path.join(directory, "edges.npy")
+        save_binary(raw_path, n, a, b, w)
+        save_binary(npy_path, n, a, b, w)
+        for name, load in [
+            ("input()", per_line),
+            ("bulk text", bulk_text),
+            ("raw int32", lambda: load_binary(raw_path, weighted=True)),
+            (".npy", lambda: load_binary(npy_path, weighted=True)),
+        ]:
+            start = perf_counter()
+            load()
+            print(f"{name:>10}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_heap(n: int = 2000, densities: tuple[int, ...] = (2, 8, 32, 128, 512)):
+    """
+    dijkstra with heapq and lazy deletion vs the indexed d-ary heap with decrease-key,
+    for different average out-degrees m / n
+    """
+    print(f"heap: n = {n}")
+    for degree in densities:
+        a, b, w = random_edges(n, n * degree, seed=degree)
+        graph = CSRGraph.from_edges(n, a, b, w)
+        adj_list = graph.to_adj_list()
+        times = []
+        for indexed, d in [(False, None), (True, 2), (True, 4), (True, 8)]:
+            start = perf_counter()
+            shortest_paths(n, 0, adj_list, indexed=indexed, d=d or 4)
+            times.append(perf_counter() - start)
+        print(f"  m / n = {degree:4}: lazy {times[0] * 1000:8.1f} ms, indexed d=2 {times[1] * 1000:8.1f} ms, "
+              f"d=4 {times[2] * 1000:8.1f} ms, d=8 {times[3] * 1000:8.1f} ms")
+
+
+def grid_graph(side: int, seed: int = 0, max_weight: int = 10) -> CSRGraph:
+    """
+    a side x side grid (vertex = row * side + col) with random weights >= 1 on both directions of every edge,
+    so the manhattan distance is an admissible heuristic
+    """
+    rng = np.random.default_rng(seed)
+    nodes = np.arange(side * side).reshape(side, side)
+    a = np.concatenate((nodes[:, :-1].ravel(), nodes[:-1, :].ravel()))
+    b = np.concatenate((nodes[:, 1:].ravel(), nodes[1:, :].ravel()))
+    w = rng.integers(1, max_weight + 1, size=len(a))
+    return CSRGraph.from_edges(side * side, a, b, w, directed=False)
+
+
+def benchmark_query(side: int = 200, n_queries: int = 50):
+    """
+    single source -> target queries on a grid: full single-source dijkstra vs early exit, bidirectional and A*
+    """
+    n = side * side
+    graph = grid_graph(side)
+    reverse = reversed_graph(n, graph)
+    rng = np.random.default_rng(1)
+    pairs = rng.integers(0, n, size=(n_queries, 2)).tolist()
+
+    def full(source, target):
+        distance, _ = shortest_paths(n, source, graph)
+        return distance[target], None, n
+
+    def manhattan(target):
+        target_row, target_col = divmod(target, side)
+        return lambda v: abs(v // side - target_row) + abs(v % side - target_col)
+
+    modes = [
+        ("full", full),
+        ("early exit", lambda s, t: shortest_path(s, t, graph, "dijkstra")),
+        ("bidirectional", lambda s, t: shortest_path(s, t, graph, "bidirectional", reverse_adj_list=reverse)),
+        ("A*", lambda s, t: shortest_path(s, t, graph, "astar", heuristic=manhattan(t))),
+    ]
+    print(f"query: {side} x {side} grid, {n_queries} random queries")
+    for name, query in modes:
+        total_settled = 0
+        start = perf_counter()
+        for source, target in pairs:
+            _, _, n_settled = query(source, target)
+            total_settled += n_settled
+        elapsed = perf_counter() - start
+        print(f"{name:>14}: {elapsed / n_queries * 1000:8.2f} ms per query, {total_settled / n_queries:10.0f} settled vertices per query")
+
+
+def benchmark_bellman_ford(n: int = 2000, m: int = 10000):
+    """
+    bellman-ford: n - 1 full rounds (the original) vs early termination, SPFA and vectorized rounds
+    """
+    a, b, w = random_edges(n, m)
+    graph = CSRGraph.from_edges(n, a, b, w)
+    adj_list = graph.to_adj_list()
+
+    def full_rounds():
+        distance = [float("inf") for _ in range(n)]
+        distance[0] = 0
+        for _ in range(n - 1):
+            for v in range(n):
+                for u, weight in adj_list[v]:
+                    if distance[u] > distance[v] + weight:
+                        distance[u] = distance[v] + weight
+        return distance
+
+    print(f"bellman_ford: n = {n}, m = {m}")
+    for name, run in [
+        ("n - 1 rounds", full_rounds),
+        ("early exit", lambda: bellman_ford.shortest_paths(n, 0, adj_list, "rounds")),
+        ("spfa", lambda: bellman_ford.shortest_paths(n, 0, adj_list, "spfa")),
+        ("numpy", lambda: bellman_ford.shortest_paths(n, 0, graph, "numpy")),
+    ]:
+        start = perf_counter()
+        run()
+        print(f"{name:>14}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_floyd_warshall(n: int = 200, large_n: int = 1000, m_per_vertex: int = 10):
+    """
+    floyd-warshall: the triple Python loop vs one broadcasted minimum per pivot, and plain vs tiled for a larger n
+    """
+    def python_loops(size, adj_list):
+        distance = [[float("inf") for _ in range(size)] for _ in range(size)]
+        for u in range(size):
+            distance[u][u] = 0
+            for v, w in adj_list[u]:
+                distance[u][v] = min(distance[u][v], w)
+        for i in range(size):
+            for u in range(size):
+                for v in range(size):
+                    if distance[u][v] > distance[u][i] + distance[i][v]:
+                        distance[u][v] = distance[u][i] + distance[i][v]
+        return distance
+
+    print(f"floyd_warshall: m = {m_per_vertex} * n")
+    for size, runs in [
+        (n, [("python loops", None), ("numpy", None)]),
+        (large_n, [("numpy", None), ("tiled 128", 128), ("tiled 256", 256)]),
+    ]:
+        graph = CSRGraph.from_edges(size, *random_edges(size, size * m_per_vertex))
+        for name, block_size in runs:
+            start = perf_counter()
+            if name == "python loops":
+                python_loops(size, graph.to_adj_list())
+            else:
+                floyd_warshall(size, graph, block_size=block_size)
+            print(f"  n = {size:5}, {name:>12}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_johnson(n: int = 1000, m: int = 5000, worker_counts: tuple[int, ...] = (1, 2, 4)):
+    """
+    all-pairs shortest paths on a sparse graph with negative edges: floyd-warshall vs johnson with a process pool
+    """
+    a, b, w = random_edges(n, m)
+    w = w - 10 # some negative edges
+    h = np.random.default_rng(2).integers(0, 50, size=n)
+    w = np.maximum(w, h[b] - h[a]) # keeps w + h[a] - h[b] >= 0, so there are no negative cycles
+    graph = CSRGraph.from_edges(n, a, b, w)
+
+    print(f"johnson: n = {n}, m = {m}")
+    start = perf_counter()
+    floyd_warshall(n, graph)
+    print(f"{'floyd-warshall':>18}: {(perf_counter() - start) * 1000:9.1f} ms")
+    for workers in worker_counts:
+        start = perf_counter()
+        johnson(n, graph, workers=workers)
+        print(f"{f'johnson {workers} worker(s)':>18}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def random_maze(n: int, m: int, wall_probability: float = 0.3, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    walls = rng.random((n, m)) < wall_probability
+    walls[0, 0] = walls[n - 1, m - 1] = False
+    return ["".join("#" if wall else "." for wall in row) for row in walls.tolist()]
+
+
+def benchmark_grid(n: int = 1000, m: int = 1000):
+    """
+    labyrinth from the top-left to the bottom-right corner: adj_list + BFS vs grid-native BFS and A*
+    """
+    maze = random_maze(n, m)
+
+    def with_adj_list():
+        adj_list = counting_rooms.build_adj_list(n, m, maze)
+        queue_bfs(adj_list, 0)
+        return adj_list
+
+    def grid_native(search):
+        def run():
+            grid = Grid(maze)
+            search(grid, grid.node(0, 0), grid.node(n - 1, m - 1))
+            return grid
+        return run
+
+    print(f"grid: {n} x {m} maze")
+    for name, run in [("adj_list", with_adj_list), ("grid bfs", grid_native(bfs)), ("grid A*", grid_native(astar))]:
+        _, elapsed, retained, peak = measure(run)
+        print(f"{name:>10}: {elapsed * 1000:9.1f} ms, memory {retained / 2**20:8.1f} MiB (peak {peak / 2**20:8.1f} MiB)")
+
+
+def snake_maze(n: int, m: int) -> list[str]:
+    """
+    a single corridor that zig-zags through the whole grid (the worst case for a recursive DFS)
+    """
+    rows = []
+    for row in range(n):
+        if row % 2 == 0:
+            rows.append("." * m)
+        elif row % 4 == 1:
+            rows.append("#" * (m - 1) + ".")
+        else:
+            rows.append("." + "#" * (m - 1))
+    return rows
+
+
+def benchmark_rooms(n: int = 1000, m: int = 1000):
+    """
+    counting rooms: DFS over adj_list vs grid BFS vs streaming two-row labeling vs vectorized labeling
+    """
+    for maze_name, maze in [("random", random_maze(n, m, wall_probability=0.45)), ("snake", snake_maze(n, m))]:
+        print(f"rooms: {n} x {m} {maze_name} maze")
+        for name, count in [
+            ("dfs", lambda: counting_rooms.count_components(n, m, maze, counting_rooms.build_adj_list(n, m, maze))),
+            ("grid bfs", lambda: count_rooms(Grid(maze))),
+            ("streaming", lambda: count_rooms_streaming(iter(maze))),
+            ("numpy", lambda: label_rooms(maze)[1]),
+        ]:
+            rooms, elapsed, retained, peak = measure(count)
+            print(f"{name:>10}: {rooms:7} rooms, {elapsed * 1000:9.1f} ms, peak memory {peak / 2**20:8.1f} MiB")
+
+
+class ListDisjointSets:
+    """
+    the previous DisjointSets of kruskal.py: a list per set, relabeling the smaller set on every join
+    """
+
+    def __init__(self, n: int):
+        self.id = [i for i in range(n)]
+        self.sets = [[i] for i in range(n)]
+
+    def check(self, a: int, b: int) -> bool:
+        return self.id[a] == self.id[b]
+
+    def join(self, a: int, b: int):
+        ia, ib = self.id[a], self.id[b]
+        if ia == ib:
+            return
+        if len(self.sets[ia]) < len(self.sets[ib]):
+            ia, ib = ib, ia
+        for e in self.sets[ib]:
+            self.id[e] = ia
+        self.sets[ia].extend(self.sets[ib])
+        self.sets[ib].clear()
+
+
+def benchmark_disjoint_sets(n: int = 10**7, n_joins: int | None = None):
+    """
+    n elements and n_joins random joins (n by default): list-per-set vs array-based, one by one and in batch
+    """
+    n_joins = n_joins or n
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, n, size=n_joins)
+    b = rng.integers(0, n, size=n_joins)
+
+    def one_by_one(ds):
+        for x, y in zip(a.tolist(), b.tolist()):
+            if not ds.check(x, y):
+                ds.join(x, y)
+
+    def batch(ds):
+        ds.union_many(a, b)
+
+    print(f"disjoint_sets: n = {n}, {n_joins} joins")
+    for name, structure, run in [
+        ("lists", ListDisjointSets, one_by_one),
+        ("arrays", DisjointSets, one_by_one),
+        ("union_many", DisjointSets, batch),
+    ]:
+        ds, _, retained, _ = measure(lambda: structure(n)) # (tracemalloc slows allocations down, so it isn't used for the time)
+        start = perf_counter()
+        run(ds)
+        elapsed = perf_counter() - start
+        del ds
+        print(f"{name:>12}: {elapsed * 1000:10.1f} ms, memory {retained / 2**20:8.1f} MiB")
+
+
+def benchmark_kruskal(n: int = 2000, m: int = 10**6):
+    """
+    Kruskal over a list of tuples vs over NumPy edge arrays, with a full sort and with Filter-Kruskal
+    """
+    a, b, w = random_edges(n, m, max_weight=10**6)
+    a[:n - 1], b[:n - 1] = np.arange(n - 1), np.arange(1, n) # a path, so the graph is connected
+    edges_list = list(zip(a.tolist(), b.tolist(), w.tolist()))
+    print(f"kruskal: n = {n}, m = {m}")
+    for name, run in [
+        ("tuples", lambda: kruskal(n, edges_list)),
+        ("sort", lambda: kruskal_arrays(n, a, b, w, "sort")),
+        ("filter", lambda: kruskal_arrays(n, a, b, w, "filter")),
+    ]:
+        start = perf_counter()
+        tree = run()
+        elapsed = perf_counter() - start
+        print(f"{name:>8}: {elapsed * 1000:9.1f} ms, {len(tree)} edges")
+
+
+def benchmark_prim(sizes: tuple[int, ...] = (500, 1000, 2000, 5000),
+                   degrees: tuple[int, ...] = (4, 8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512)):
+    """
+    Prim's algorithm with the dense O(n^2) matrix vs the indexed heap, for different average degrees 2m / n,
+    to find where the dense variant starts winning (mst.dense_cutover)
+    """
+    print("prim")
+    for n in sizes:
+        cutover = None
+        for degree in degrees:
+            if degree >= n:
+                break
+            a, b, w = random_edges(n, n * degree // 2, seed=degree, max_weight=10**6)
+            a[:n - 1], b[:n - 1] = np.arange(n - 1), np.arange(1, n)
+            times = []
+            for method in ("dense", "heap"):
+                start = perf_counter()
+                prim_arrays(n, a, b, w, method)
+                times.append(perf_counter() - start)
+            if cutover is None and times[0] < times[1]:
+                cutover = degree
+            print(f"  n = {n:6}, 2m / n = {degree:4}: dense {times[0] * 1000:8.1f} ms, heap {times[1] * 1000:8.1f} ms")
+        print(f"  n = {n:6}: dense wins from 2m / n = {cutover} (dense_cutover: {dense_cutover(n):.0f})")
+
+
+def benchmark_boruvka(n: int = 10**6, m: int = 10**7, worker_counts: tuple[int, ...] = (1, 2, 4, 8)):
+    """
+    Kruskal vs Borůvka with a growing number of worker processes, on a large sparse graph
+    """
+    a, b, w = random_edges(n, m, max_weight=10**9)
+    a[:n - 1], b[:n - 1] = np.arange(n - 1), np.arange(1, n)
+    print(f"boruvka: n = {n}, m = {m} ({os.cpu_count()} cpus)")
+    start = perf_counter()
+    kruskal_arrays(n, a, b, w)
+    print(f"{'kruskal':>20}: {(perf_counter() - start) * 1000:9.1f} ms")
+    for workers in worker_counts:
+        start = perf_counter()
+        boruvka_arrays(n, a, b, w, workers=workers)
+        print(f"{f'boruvka {workers} worker(s)':>20}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_tree_index(n: int = 10**6, n_queries: int = 10**6):
+    """
+    building a TreeIndex over a random tree, and batched distance / k-th ancestor queries
+    """
+    rng = np.random.default_rng(0)
+    parent = (rng.random(n - 1) * np.arange(1, n)).astype(np.int64) # node i + 1 hangs from a random earlier node
+    graph = CSRGraph.from_edges(n, np.arange(1, n), parent, directed=False)
+    u = rng.integers(0, n, size=n_queries)
+    v = rng.integers(0, n, size=n_queries)
+
+    print(f"tree_index: n = {n}, {n_queries} queries")
+    index, elapsed, retained, _ = measure(lambda: TreeIndex(graph))
+    print(f"{'build':>14}: {elapsed * 1000:9.1f} ms, memory {retained / 2**20:8.1f} MiB")
+    for name, run in [
+        ("distance", lambda: index.distance(u, v)),
+        ("kth_ancestor", lambda: index.kth_ancestor(u, rng.integers(0, 10, size=n_queries))),
+        ("diameter", lambda: index.diameter()),
+    ]:
+        start = perf_counter()
+        run()
+        print(f"{name:>14}: {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_topological(n: int = 10**5, m: int = 10**6, n_insertions: int = 1000):
+    """
+    levelized Kahn over a random DAG, and inserting edges one by one:
+    the incremental order (Pearce-Kelly) vs sorting everything again after every insertion
+    """
+    rng = np.random.default_rng(0)
+    rank = rng.permutation(n) # the edges go from lower to higher rank, so the graph is a DAG
+    a, b, _ = random_edges(n, m + n_insertions)
+    a, b = np.where(rank[a] < rank[b], a, b), np.where(rank[a] < rank[b], b, a)
+    keep = a != b
+    a, b = a[keep], b[keep]
+    graph = CSRGraph.from_edges(n, a[:m], b[:m])
+
+    print(f"topological: n = {n}, m = {m}")
+    start = perf_counter()
+    levels = topological_levels(graph)
+    print(f"{'kahn levels':>14}: {(perf_counter() - start) * 1000:9.1f} ms, {len(levels)} levels")
+
+    incremental = IncrementalTopologicalOrder(n, graph)
+    start = perf_counter()
+    for u, v in zip(a[m:].tolist(), b[m:].tolist()):
+        incremental.add_edge(u, v)
+    per_insertion = (perf_counter() - start) / n_insertions
+    print(f"{'incremental':>14}: {per_insertion * 1e6:9.1f} us per insertion")
+
+    start = perf_counter()
+    for k in range(10): # a few full resorts are enough to see the cost of one
+        topological_levels(CSRGraph.from_edges(n, a[:m + k + 1], b[:m + k + 1]))
+    print(f"{'full resort':>14}: {(perf_counter() - start) / 10 * 1e6:9.1f} us per insertion")
+
+
+def benchmark_bipartite(n: int = 10**6, m: int = 2 * 10**6):
+    """
+    edges per second: the online parity union-find (one edge at a time) and the batch BFS coloring
+    (the edges always go between even and odd nodes, so the graph stays bipartite until the end)
+    """
+    a, b, _ = random_edges(n, m)
+    b = b | 1
+    a = a & ~1
+    print(f"bipartite: n = {n}, m = {m}")
+    checker = bipartite_check.OnlineBipartiteness(n)
+    start = perf_counter()
+    checker.add_edges(a, b)
+    elapsed = perf_counter() - start
+    print(f"{'online':>10}: {elapsed * 1000:9.1f} ms, {m / elapsed:12.0f} edges/s")
+
+    graph = CSRGraph.from_edges(n, a, b, directed=False)
+    start = perf_counter()
+    bipartite_check.odd_cycle(graph)
+    elapsed = perf_counter() - start
+    print(f"{'batch BFS':>10}: {elapsed * 1000:9.1f} ms, {m / elapsed:12.0f} edges/s (one check of the whole graph)")
+
+
+def benchmark_direction_optimizing(n: int = 10**6):
+    """
+    queue_bfs vs bfs_arrays top-down only and direction-optimizing, on a sparse high-diameter graph (a grid),
+    a sparse random graph, a low-diameter dense one and one with hubs (the endpoints of the edges are skewed
+    towards the first nodes, so a few of them have a huge degree)
+    """
+    side = int(n ** 0.5)
+    cell = np.arange(side * side).reshape(side, side)
+    grid_a = np.concatenate((cell[:, :-1].ravel(), cell[:-1, :].ravel()))
+    grid_b = np.concatenate((cell[:, 1:].ravel(), cell[1:, :].ravel()))
+    graphs = [("grid", side * side, grid_a, grid_b)]
+    for size, degree in ((n, 4), (n // 4, 32)):
+        a, b, _ = random_edges(size, size * degree // 2, seed=degree)
+        graphs.append((f"random, 2m / n = {degree}", size, a, b))
+    rng = np.random.default_rng(0)
+    hub_a = (n * rng.random(4 * n) ** 4).astype(np.int64)
+    graphs.append(("hubs, 2m / n = 8", n, hub_a, rng.integers(0, n, 4 * n)))
+
+    print("direction-optimizing bfs")
+    for name, size, a, b in graphs:
+        graph = CSRGraph.from_edges(size, a, b, directed=False)
+        times = []
+        start = perf_counter()
+        queue_bfs(graph, 0)
+        times.append(perf_counter() - start)
+        for optimizing in (False, True):
+            start = perf_counter()
+            distance, _ = bfs_module.bfs_arrays(graph, 0, direction_optimizing=optimizing)
+            times.append(perf_counter() - start)
+        print(f"  {name:>22} (n = {size}, {int(distance.max())} levels): queue {times[0] * 1000:9.1f} ms, "
+              f"top-down {times[1] * 1000:9.1f} ms, direction-optimizing {times[2] * 1000:9.1f} ms")
+
+
+def benchmark_path_tree(n: int = 20000, k: int = 1000):
+    """
+    extracting the path to every node of a path graph (total output n^2 / 2) by walking pred back and reversing,
+    vs PathTree.path for every node (which must keep up with the plain walk) and streaming them with
+    PathTree.iter_paths; then the paths to k random targets of a random tree
+    """
+    print("path extraction")
+    path_graph = CSRGraph.from_edges(n, np.arange(n - 1), np.arange(1, n), directed=False)
+    parents = np.random.default_rng(0).integers(0, np.arange(1, n))
+    random_tree = CSRGraph.from_edges(n, parents, np.arange(1, n), directed=False)
+    for name, graph in (("path graph", path_graph), ("random tree", random_tree)):
+        tree = bfs_module.shortest_path_tree(graph, 0)
+        pred = tree.pred.tolist()
+        start = perf_counter()
+        total_walk = 0
+        for node in range(n):
+            path = []
+            while node != 0:
+                path.append(node)
+                node = pred[node]
+            path.append(0)
+            path.reverse()
+            total_walk += len(path)
+        walk_time = perf_counter() - start
+        start = perf_counter()
+        total_path = sum(len(tree.path(node)) for node in range(n))
+        path_time = perf_counter() - start
+        start = perf_counter()
+        total_stream = sum(len(path) for _, path in tree.iter_paths())
+        stream_time = perf_counter() - start
+        assert total_walk == total_path == total_stream
+        targets = np.random.default_rng(1).integers(0, n, k)
+        start = perf_counter()
+        tree.paths(targets)
+        batch_time = perf_counter() - start
+        print(f"  {name:>12} (n = {n}, {total_walk} path nodes): walk and reverse {walk_time * 1000:9.1f} ms, "
+              f"path {path_time * 1000:9.1f} ms, iter_paths {stream_time * 1000:9.1f} ms, "
+              f"paths to {k} targets {batch_time * 1000:9.1f} ms")
+        # PathTree.path does the same walk, so on the long paths it must not fall behind the plain loop
+        # (with some room for noise)
+        if name == "path graph":
+            assert path_time < 1.5 * walk_time, f"PathTree.path is slower than walking pred: {path_time:.2f} s vs {walk_time:.2f} s"
+
+
+def forward_graph(n: int, m: int, seed: int = 0) -> CSRGraph:
+    """
+    a directed graph like a dependency graph: the edges go forward, to a random later node or to one a few nodes
+    ahead, except 5% that go a few nodes back (closing small cycles)
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, n, m)
+    near = np.minimum(a + rng.geometric(1 / 5, m), n - 1)
+    far = a + (rng.random(m) * (n - a)).astype(np.int64)
+    b = np.where(rng.random(m) < 0.5, near, far)
+    back = rng.random(m) < 0.05
+    b[back] = np.maximum(a[back] - rng.geometric(1 / 5, int(back.sum())), 0)
+    return CSRGraph.from_edges(n, a, b)
+
+
+def benchmark_reachability(n: int = 10**6, m: int = 3 * 10**6, n_queries: int = 10**4, n_searches: int = 5,
+                           chain: int = 3 * 10**5):
+    """
+    strongly connected components and a ReachabilityIndex (interval labels for n nodes, a bitset closure for n / 100),
+    with queries answered by the index vs one depth-first search per query;
+    then the index of a single chain of length chain (as many topological levels as nodes)
+    """
+    print("reachability")
+    rng = np.random.default_rng(1)
+    for size in (n, n // 100):
+        graph = forward_graph(size, size * m // n)
+        start = perf_counter()
+        _, n_components = strongly_connected_components(graph)
+        scc_time = perf_counter() - start
+        start = perf_counter()
+        index = ReachabilityIndex(graph)
+        build_time = perf_counter() - start
+        u, v = rng.integers(0, size, n_queries), rng.integers(0, size, n_queries)
+        start = perf_counter()
+        answers = index.reaches(u, v)
+        query_time = perf_counter() - start
+        search = DepthFirstSearch(graph)
+        start = perf_counter()
+        for x, y, answer in zip(u[:n_searches].tolist(), v[:n_searches].tolist(), answers.tolist()):
+            search.reset()
+            search.search(x)
+            assert bool(search.visited[y]) == answer
+        search_time = (perf_counter() - start) / n_searches
+        kind = "labels" if index.closure is None else "closure"
+        print(f"  n = {size} ({n_components} components): scc {scc_time * 1000:9.1f} ms, index ({kind}) {build_time * 1000:9.1f} ms, "
+              f"{n_queries} queries {query_time * 1000:9.1f} ms ({int(answers.sum())} reachable), "
+              f"one search per query {search_time * 1000:9.1f} ms each")
+    graph = CSRGraph.from_edges(chain, np.arange(chain - 1), np.arange(1, chain))
+    start = perf_counter()
+    strongly_connected_components(graph)
+    scc_time = perf_counter() - start
+    start = perf_counter()
+    ReachabilityIndex(graph)
+    print(f"  chain of {chain}: scc {scc_time * 1000:9.1f} ms, index {(perf_counter() - start) * 1000:9.1f} ms")
+
+
+def benchmark_dynamic_shortest_paths(side: int = 300, n_changes: int = 200, n_recomputations: int = 3):
+    """
+    random weight changes (both directions of a road of a grid, x0.5 to x2) repaired by DynamicShortestPaths
+    vs a full shortest_paths after every change
+    """
+    graph = grid_graph(side)
+    n = side * side
+    rng = np.random.default_rng(0)
+    start = perf_counter()
+    paths = DynamicShortestPaths(graph, 0)
+    build_time = perf_counter() - start
+    touched = []
+    start = perf_counter()
+    for u in rng.integers(0, n, n_changes).tolist():
+        slot = paths.offsets[u] + int(rng.integers(0, paths.offsets[u + 1] - paths.offsets[u]))
+        v = paths.targets[slot]
+        w = max(1, int(paths.weights[slot] * rng.choice([0.5, 2])))
+        touched.append(paths.set_weight(u, v, w) + paths.set_weight(v, u, w))
+    repair_time = (perf_counter() - start) / n_changes
+    graph.weights[:] = paths.weights
+    start = perf_counter()
+    for _ in range(n_recomputations):
+        expected, _ = shortest_paths(n, 0, graph, indexed=True)
+    full_time = (perf_counter() - start) / n_recomputations
+    assert expected == paths.distance
+    print(f"dynamic shortest paths (grid {side} x {side}): first run {build_time * 1000:9.1f} ms, "
+          f"repair {repair_time * 1000:9.3f} ms per change (median {int(np.median(touched))} vertices touched), "
+          f"full recomputation {full_time * 1000:9.1f} ms")
+
+
+BENCHMARKS = {
+    "csr": benchmark_csr,
+    "loader": benchmark_loader,
+    "heap": benchmark_heap,
+    "query": benchmark_query,
+    "bellman_ford": benchmark_bellman_ford,
+    "floyd_warshall": benchmark_floyd_warshall,
+    "johnson": benchmark_johnson,
+    "grid": benchmark_grid,
+    "rooms": benchmark_rooms,
+    "disjoint_sets": benchmark_disjoint_sets,
+    "kruskal": benchmark_kruskal,
+    "prim": benchmark_prim,
+    "boruvka": benchmark_boruvka,
+    "tree_index": benchmark_tree_index,
+    "topological": benchmark_topological,
+    "bipartite": benchmark_bipartite,
+    "direction_optimizing": benchmark_direction_optimizing,
+    "path_tree": benchmark_path_tree,
+    "reachability": benchmark_reachability,
+    "dynamic_shortest_paths": benchmark_dynamic_shortest_paths,
+}
+
+
+def main():
+    # usage: python benchmarks.py [name ...] (runs every benchmark when no name is given)
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,128 @@
-from collections import deque
+import numpy as np
 
-adj_list = []
-distance = []
-pred = []
+from csr_graph import CSRGraph
+from graph_loader import read_graph
+from path_tree import PathTree
 
-def bfs(source: int):
-    # breadth-first search
-    Q = deque()
-    Q.append(source)
+
+def top_down_step(graph: CSRGraph, frontier: np.ndarray, visited: np.ndarray, pred: np.ndarray) -> np.ndarray:
+    """
+    scans the out-edges of the frontier and claims the unvisited nodes they reach
+    return: the next frontier
+    """
+    sources, slots = graph.out_edges(frontier)
+    targets = graph.targets[slots]
+    new = ~visited[targets]
+    nodes, first = np.unique(targets[new], return_index=True) # several frontier nodes may reach the same node
+    pred[nodes] = sources[new][first]
+    return nodes.astype(np.int64)
+
+
+def bottom_up_step(reverse: CSRGraph, in_frontier: np.ndarray, visited: np.ndarray, pred: np.ndarray,
+                   rounds: int = 8) -> np.ndarray:
+    """
+    every unvisited node looks for a parent in the frontier among its in-neighbors, and stops at the first one:
+    round j < rounds checks the j-th in-neighbor of the nodes that haven't found a parent yet (most of them find
+    one in the first rounds), and then the rest of the in-edges of the nodes still looking are checked in one pass,
+    with a segmented reduction (one segment per node) that finds the first hit of every node,
+    so the number of passes doesn't grow with the largest in-degree
+    return: the next frontier
+    """
+    candidates = np.flatnonzero(~visited)
+    found = []
+    for j in range(rounds):
+        slots = reverse.offsets[candidates] + j
+        left = slots < reverse.offsets[candidates + 1]
+        candidates, slots = candidates[left], slots[left]
+        neighbors = reverse.targets[slots]
+        hit = in_frontier[neighbors]
+        pred[candidates[hit]] = neighbors[hit]
+        found.append(candidates[hit])
+        candidates = candidates[~hit]
+
+    starts = reverse.offsets[candidates] + rounds
+    lengths = reverse.offsets[candidates + 1] - starts
+    left = lengths > 0
+    candidates, starts, lengths = candidates[left], starts[left], lengths[left]
+    if len(candidates) > 0:
+        # the remaining in-edges of the candidates one after the other, candidates[i] from segment_starts[i]
+        segment_starts = np.cumsum(lengths) - lengths
+        total = int(segment_starts[-1] + lengths[-1])
+        neighbors = reverse.targets[np.arange(total) + np.repeat(starts - segment_starts, lengths)]
+        hit = in_frontier[neighbors]
+        has_parent = np.logical_or.reduceat(hit, segment_starts)
+        first = np.minimum.reduceat(np.where(hit, np.arange(total), total), segment_starts)[has_parent]
+        pred[candidates[has_parent]] = neighbors[first]
+        found.append(candidates[has_parent])
+    return np.sort(np.concatenate(found))
+
+
+def bfs_arrays(graph: CSRGraph, source: int, reverse: CSRGraph | None = None, direction_optimizing: bool = True,
+               alpha: float = 14, beta: float = 24) -> tuple[np.ndarray, np.ndarray]:
+    """
+    graph: the graph as a CSRGraph
+    reverse: the graph with every edge reversed, for the bottom-up steps (None if graph is undirected)
+    direction_optimizing: if False, every step is top-down (a level-synchronous BFS)
+    return: (distance, pred) as int64 arrays, with -1 for the nodes that are not reachable (and pred[source] = -1)
+
+    direction-optimizing BFS (Beamer): the frontier and the visited set are boolean arrays, and each level is
+    expanded either top-down (the frontier scans its out-edges) or bottom-up (the unvisited nodes look for
+    a parent in the frontier); bottom-up pays off when the frontier has more than 1/alpha of the edges left
+    to explore, and it goes back to top-down once the frontier has less than n/beta nodes
+    """
+    n = graph.n
+    reverse = reverse if reverse is not None else graph
+    degree = np.diff(graph.offsets)
+    distance = np.full(n, -1, dtype=np.int64)
+    pred = np.full(n, -1, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    in_frontier = np.zeros(n, dtype=bool)
+
+    frontier = np.array([source], dtype=np.int64)
+    visited[source] = True
     distance[source] = 0
-    while len(Q) > 0:
-        node = Q.popleft()
-        for neighbour in adj_list[node]:
-            if distance[neighbour] is None:
-                distance[neighbour] = distance[node] + 1
-                pred[neighbour] = node
-                Q.append(neighbour)
+    unexplored_edges = int(degree.sum()) - int(degree[source]) # the edges of the nodes not visited yet
+    bottom_up = False
+    level = 0
+    while len(frontier) > 0:
+        if direction_optimizing:
+            frontier_edges = int(degree[frontier].sum())
+            if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / beta:
+                bottom_up = False
+        if bottom_up:
+            in_frontier[frontier] = True
+            frontier = bottom_up_step(reverse, in_frontier, visited, pred)
+            in_frontier[:] = False
+        else:
+            frontier = top_down_step(graph, frontier, visited, pred)
+        level += 1
+        visited[frontier] = True
+        distance[frontier] = level
+        unexplored_edges -= int(degree[frontier].sum())
+    return distance, pred
+
 
+def shortest_path_tree(graph: CSRGraph, source: int, reverse: CSRGraph | None = None) -> PathTree:
+    """
+    return: the shortest paths (in number of edges) from source to every node, as a PathTree built from bfs_arrays
+    """
+    distance, pred = bfs_arrays(graph, source, reverse)
+    return PathTree(pred, distance)
 
 
 def main():
-    global adj_list, distance, pred
-    n_nodes, n_edges = map(int, input().split())
-    adj_list = [[] for _ in range(n_nodes)]
-    distance = [None for _ in range(n_nodes)] # initially it is none for every node
-    pred = [None for _ in range(n_nodes)]
-
-    for _ in range(n_edges):
-        a, b = map(int, input().split())
-        adj_list[a].append(b)
-        adj_list[b].append(a)
-
-    bfs(0)
-    for node in range(n_nodes):
-        print(f"{node} -> {distance[node]}")
-        path = []
-        current_node = node
-        while current_node != 0:
-            path.append(current_node)
-            current_node = pred[current_node]
-        path.append(0)
-        path.reverse()
-        print(f"{node} -> {path}")
+    graph = read_graph(directed=False) # "n_nodes n_edges" and then the edges "a b"
+    tree = shortest_path_tree(graph, 0)
+    depth = tree.depth.tolist()
+    for node in range(graph.n):
+        if depth[node] == -1:
+            print(f"{node} -> None")
+            continue
+        print(f"{node} -> {depth[node]}")
+        print(f"{node} -> {tree.path(node)}")
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,38 +1,165 @@
-adj_list = []
-color = []
-is_bipartite = True
-
-def dfs(node: int):
-    global is_bipartite
-    for neighbor in adj_list[node]:
-        if color[neighbor] is None:
-            color[neighbor] = not color[node]
-            dfs(neighbor)
-        elif color[neighbor] == color[node]:
-            is_bipartite = False 
-            return 
+import sys
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from disjoint_sets import ParityDisjointSets, component_roots
+from graph_loader import read_graph
+from tree_index import bfs_tree
+
+
+def bfs_coloring(graph: CSRGraph) -> tuple[np.ndarray, np.ndarray, tuple[int, int] | None]:
+    """
+    colors every node with the parity of its depth in a BFS forest (one root per connected component,
+    found with component_roots, and all the components explored at once by bfs_tree)
+    return: (color, parent, conflict), where conflict is an edge (a, b) whose endpoints got the same color,
+        or None if color is a valid 2-coloring
+    """
+    n = graph.n
+    sources, targets, _ = graph.edge_arrays()
+    roots = np.flatnonzero(component_roots(n, sources, targets) == np.arange(n))
+    parent, _, depth, _ = bfs_tree(graph, roots)
+    color = depth & 1
+    conflicts = np.flatnonzero(color[sources] == color[targets])
+    if len(conflicts) == 0:
+        return color, parent, None
+    edge = int(conflicts[0])
+    return color, parent, (int(sources[edge]), int(targets[edge]))
+
+
+def odd_cycle(adj_list) -> list[int] | None:
+    """
+    adj_list[u] is the list of neighbors of u (undirected graph)
+    return: the nodes of a cycle of odd length (in the order of its edges), or None if the graph is bipartite
+
+    an edge (a, b) between two nodes of the same color closes a cycle with the tree paths from a and b
+    to their lowest common ancestor, and both paths have the same parity, so the cycle is odd
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    _, parent, conflict = bfs_coloring(graph)
+    if conflict is None:
+        return None
+    a, b = conflict
+    # both have the same depth parity, and the same depth in fact (BFS edges join equal or consecutive levels)
+    left, right = [a], [b]
+    while left[-1] != right[-1]:
+        left.append(int(parent[left[-1]]))
+        right.append(int(parent[right[-1]]))
+    right.pop() # the common ancestor is already at the end of left
+    return left[::-1] + right # ancestor ... a, then b ... (and b --> ancestor closes it)
+
+
+def bipartite_coloring(adj_list) -> list[int] | None:
+    """
+    adj_list[u] is the list of neighbors of u (undirected graph)
+    return: a list color[] with values 0/1 such that every edge joins two different colors,
+        or None if the graph is not bipartite
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    color, _, conflict = bfs_coloring(graph)
+    return color.tolist() if conflict is None else None
+
+
+class OnlineBipartiteness:
+    """
+    tells whether a graph is still bipartite while its edges arrive one by one
+
+    every edge (a, b) is the constraint "a and b have different colors" in a ParityDisjointSets,
+    so each insertion takes O(alpha(n)) amortized time
+    conflict: the first edge that made the graph non-bipartite (None while it is bipartite)
+    """
+
+    def __init__(self, n: int):
+        self.sets = ParityDisjointSets(n)
+        self.n_edges = 0
+        self.conflict = None
+
+    @property
+    def is_bipartite(self) -> bool:
+        return self.conflict is None
+
+    def add_edge(self, a: int, b: int) -> bool:
+        """
+        return: True if the graph is still bipartite after adding the edge a - b
+        """
+        self.n_edges += 1
+        if self.conflict is None and not self.sets.join(a, b):
+            self.conflict = (a, b)
+        return self.conflict is None
+
+    def add_edges(self, a, b) -> int:
+        """
+        a, b: arrays (or lists) of endpoints, the edges are added in order
+        return: the position of the first edge that makes the graph non-bipartite, or -1 if it is still bipartite
+            (the edges after that one are not added, and if the graph was already not bipartite none is, and it returns 0)
+        """
+        if self.conflict is not None: # like add_edge, nothing changes once the graph is not bipartite
+            return 0
+        join = self.sets.join
+        for i, (x, y) in enumerate(zip(np.asarray(a).tolist(), np.asarray(b).tolist())):
+            self.n_edges += 1
+            if not join(x, y):
+                self.conflict = (x, y)
+                return i
+        return -1
+
+    def color(self, a: int) -> int:
+        """
+        return: the color of a in a valid 2-coloring of the edges added so far (while it is bipartite)
+        """
+        return self.sets.find(a)[1]
+
+
+def stress_test(rounds: int = 500, n: int = 12, seed: int = 0):
+    """
+    random graphs given in batches: OnlineBipartiteness must agree with bipartite_coloring on every prefix,
+    and once a batch finds a conflict, the later batches must not change it
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(rounds):
+        m = int(rng.integers(1, 3 * n))
+        a, b = rng.integers(0, n, m), rng.integers(0, n, m)
+        checker = OnlineBipartiteness(n)
+        first_conflict = None
+        for start in range(0, m, 4):
+            position = checker.add_edges(a[start : start + 4], b[start : start + 4])
+            if first_conflict is not None:
+                assert position == 0 and checker.conflict == first_conflict and not checker.is_bipartite
+                continue
+            end = start + 4 if position == -1 else start + position + 1
+            graph = CSRGraph.from_edges(n, a[:end], b[:end], directed=False)
+            assert checker.is_bipartite == (bipartite_coloring(graph) is not None)
+            if position != -1:
+                first_conflict = checker.conflict
+                assert first_conflict == (int(a[start + position]), int(b[start + position]))
+    print("All correct!")
+
 
 def main():
-    n_nodes, n_edges = map(int, input().split())
-    adj_list = [[] for _ in range(n_nodes)]
-    color = [None for _ in range(n_nodes)]
-    
-    for _ in range(n_edges):
-        a, b = map(int, input().split())
-        adj_list[a].append(b)
-        adj_list[b].append(a)
-        
-    for node in range(n_nodes):
-        if color[node] is None: # i.e: it hasn't been colored/visited yet
-            color[node] = 0
-            dfs(node)
-        
-    if is_bipartite:
-        print("it is bipartite")
-    else:
-        print("it is not bipartite")
-    
-    
+    # input: "n_nodes n_edges" and then the edges "a b"
+    # usage: python bipartite_check.py [--batch | --stress] (--stress reads no input, it runs stress_test)
+    #   by default the edges are processed as a stream, and it reports the first edge after which
+    #   the graph is not bipartite; with --batch the whole graph is read and it prints an odd cycle
+    if '--stress' in sys.argv[1:]:
+        stress_test()
+        return
+    if '--batch' in sys.argv[1:]:
+        cycle = odd_cycle(read_graph(directed=False))
+        if cycle is None:
+            print("it is bipartite")
+        else:
+            print("it is not bipartite, odd cycle:", cycle)
+        return
+
+    n, m = map(int, sys.stdin.readline().split())
+    checker = OnlineBipartiteness(n)
+    for i in range(m):
+        a, b = map(int, sys.stdin.readline().split())
+        if not checker.add_edge(a, b):
+            print(f"it is not bipartite since edge number {i} ({a} - {b})")
+            return
+    print("it is bipartite")
+
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
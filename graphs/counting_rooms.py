@@ -1,68 +1,65 @@
 import sys
 
-adj_list = []
-visited = []
-maze = []
-
-# depth-first search
-def dfs(node: int):
-    visited[node] = True 
-    for neighbor in adj_list[node]:
-        if not visited[neighbor]:
-            dfs(neighbor)
-
-def count_components(n: int, m: int):
-    global adj_list, visited
-    
-    n_nodes = n * m
-    
-    count_connected_components = 0
-    for node in range(n_nodes):
-        row, col = node // m, node % m 
-        if maze[row][col] == '#':
-            continue 
-        if not visited[node]:
-            count_connected_components += 1
-            dfs(node)
-    return count_connected_components
+from dfs_engine import DepthFirstSearch
+from room_labeling import count_rooms_streaming, read_rows
 
 moves_list = [
     (-1, 0), # UP
     (1, 0), # DOWN
     (0, -1), # LEFT
-    (0, 1) # RIGHT 
+    (0, 1) # RIGHT
 ]
 
-def main():
-    global adj_list, visited , maze 
-    
-    n, m = map(int, input().split())
-    for _ in range(n):
-        row = input()
-        maze.append(row)
-    
-    n_nodes = n * m 
+def build_adj_list(n: int, m: int, maze: list[str]) -> list[list[int]]:
+    """
+    node = row * m + col; every free cell is connected to its free neighbors
+    """
+    n_nodes = n * m
     adj_list = [[] for _ in range(n_nodes)]
-    visited = [False for _ in range(n_nodes)]
-    
+
     for row in range(n):
         for col in range(m):
             if maze[row][col] == '#':
-                continue 
-            node = row * m + col 
+                continue
+            node = row * m + col
             for delta_row, delta_col in moves_list:
-                neighbor_row = row + delta_row 
-                neighbor_col = col + delta_col 
+                neighbor_row = row + delta_row
+                neighbor_col = col + delta_col
                 if 0 <= neighbor_row < n and 0 <= neighbor_col < m and maze[neighbor_row][neighbor_col] != '#':
                     # if i don't leave the grid and the neighboring is a free cell (not a wall)
-                    neighbor = neighbor_row * m + neighbor_col 
-                
+                    neighbor = neighbor_row * m + neighbor_col
+
                     adj_list[node].append(neighbor) # only considering the pair (node, neighbor)
                     # because the symmetric pair will be considered later in the code when row,col correspond to neighbor
-            
-    print(count_components(n, m))
-    
-    
+    return adj_list
+
+def count_components(n: int, m: int, maze: list[str], adj_list: list[list[int]]) -> int:
+    # depth-first search with an explicit stack, so a long snake-like room can't overflow the call stack
+    search = DepthFirstSearch(adj_list)
+
+    n_nodes = n * m
+
+    count_connected_components = 0
+    for node in range(n_nodes):
+        row, col = node // m, node % m
+        if maze[row][col] == '#':
+            continue
+        if search.search(node) > 0: # it wasn't visited yet
+            count_connected_components += 1
+    return count_connected_components
+
+def main():
+    # usage: python counting_rooms.py [--dfs]
+    # by default the rows are read one by one and only the previous one is kept, so the maze may be larger than memory
+    # (grid_search.count_rooms and room_labeling.label_rooms count the rooms of a maze that is already in memory);
+    # with --dfs the whole maze is read, turned into an adj_list and the rooms are counted with a depth-first search
+    if '--dfs' in sys.argv[1:]:
+        maze = [row.decode().rstrip('\r\n') for row in read_rows()]
+        n, m = len(maze), len(maze[0]) if maze else 0
+        print(count_components(n, m, maze, build_adj_list(n, m, maze)))
+        return
+    print(count_rooms_streaming(read_rows()))
+
+
 if __name__ == '__main__':
-    sys.setrecursionlimit(10**9)
     main()
@@ -0,0 +1,196 @@
+import numpy as np
+
+
+class CSRGraph:
+    """
+    compressed sparse row (CSR) representation of a graph with n vertices and m (directed) edges
+
+    offsets: n + 1 integers, the out-edges of u are stored in positions offsets[u] .. offsets[u + 1] - 1
+    targets: m integers, targets[i] is the head of the i-th edge
+    weights: m numbers (or None for unweighted graphs), weights[i] is the weight of the i-th edge
+
+    an undirected graph is stored with both directions of every edge (so m = 2 * number of edges)
+
+    it can be used in place of the usual adj_list (list of lists), so every function of graphs/ that takes
+    an adj_list takes a CSRGraph as well (with weights, for the weighted algorithms):
+        len(graph) == n, and graph[u] is the list of neighbors of u
+        (or the list of tuples (v, w) when the graph is weighted)
+    graph[u] builds a new list on every call, it's only an adapter; the loops that go through the edges of
+    many vertices use edges_of(adj_list), which reads the arrays in place (see out)
+    """
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray | None = None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._views = None # see out
+
+    def __getstate__(self):
+        # memoryviews can't be pickled (or deep-copied): they are dropped and out builds them again when needed
+        state = self.__dict__.copy()
+        state['_views'] = None
+        return state
+
+    @staticmethod
+    def index_dtype(n: int):
+        # int32 is enough for the labels of up to 2^31 - 1 vertices and halves the memory
+        return np.int32 if n < 2**31 else np.int64
+
+    @classmethod
+    def from_edges(cls, n: int, sources, targets, weights=None, directed: bool = True) -> "CSRGraph":
+        """
+        n: number of vertices (labeled from 0 to n - 1)
+        sources, targets: arrays (or lists) of length m, the i-th edge goes from sources[i] to targets[i]
+        weights: array (or list) of length m with the weight of every edge, or None
+        directed: if False, every edge is inserted in both directions
+
+        builds the graph in one bulk pass (a counting sort of the edges by their source)
+        """
+        index_dtype = cls.index_dtype(n)
+        sources = np.asarray(sources, dtype=index_dtype)
+        targets = np.asarray(targets, dtype=index_dtype)
+        if weights is not None:
+            weights = np.asarray(weights)
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            if weights is not None:
+                weights = np.concatenate((weights, weights))
+
+        counts = np.bincount(sources, minlength=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        order = np.argsort(sources, kind="stable") # stable, so the edges of u keep their input order
+        targets = targets[order]
+        if weights is not None:
+            weights = weights[order]
+        return cls(offsets, targets, weights)
+
+    @classmethod
+    def from_adj_list(cls, adj_list: list[list[int]] | list[list[tuple[int,int]]]) -> "CSRGraph":
+        """
+        converts the usual adj_list (list of neighbors, or list of tuples (v, w)) into a CSRGraph
+        """
+        n = len(adj_list)
+        counts = np.fromiter((len(neighbors) for neighbors in adj_list), dtype=np.int64, count=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        m = int(offsets[-1])
+
+        weighted = any(len(neighbors) > 0 and isinstance(neighbors[0], tuple) for neighbors in adj_list)
+        if not weighted:
+            targets = np.fromiter((v for neighbors in adj_list for v in neighbors), dtype=cls.index_dtype(n), count=m)
+            return cls(offsets, targets)
+        targets = np.fromiter((v for neighbors in adj_list for v, _ in neighbors), dtype=cls.index_dtype(n), count=m)
+        weights = np.array([w for neighbors in adj_list for _, w in neighbors])
+        return cls(offsets, targets, weights)
+
+    @property
+    def n(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def m(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        memory used by the buffers of the graph, in bytes
+        """
+        total = self.offsets.nbytes + self.targets.nbytes
+        if self.weights is not None:
+            total += self.weights.nbytes
+        return total
+
+    def degree(self, u: int) -> int:
+        return int(self.offsets[u + 1] - self.offsets[u])
+
+    def neighbors(self, u: int) -> list[int]:
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return self.targets[lo:hi].tolist()
+
+    def edges(self, u: int) -> list[tuple[int,int]]:
+        """
+        returns the out-edges of u as a list of tuples (v, w)
+        """
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return list(zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist()))
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, u: int):
+        # same interface as adj_list[u]
+        if self.weights is None:
+            return self.neighbors(u)
+        return self.edges(u)
+
+    def out(self, u: int):
+        """
+        the out-edges of u as an iterable (of neighbors, or of tuples (v, w) if the graph is weighted)
+        that reads the arrays in place, without building a list
+        """
+        if self._views is None:
+            # zero-copy views of the arrays: indexing or slicing them is much cheaper than with NumPy, one item at a time
+            self._views = (memoryview(self.offsets), memoryview(self.targets),
+                           None if self.weights is None else memoryview(self.weights))
+        offsets, targets, weights = self._views
+        lo, hi = offsets[u], offsets[u + 1]
+        if weights is None:
+            return targets[lo:hi]
+        return zip(targets[lo:hi], weights[lo:hi])
+
+    def edge_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        """
+        returns (sources, targets, weights), the edge list form of the graph
+        """
+        sources = np.repeat(np.arange(self.n, dtype=self.targets.dtype), np.diff(self.offsets))
+        return sources, self.targets, self.weights
+
+    def out_edges(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        nodes: an array of vertices
+        return: (sources, slots) for all their out-edges at once, so the i-th edge goes from sources[i]
+            to targets[slots[i]] (with weight weights[slots[i]])
+        """
+        starts = self.offsets[nodes]
+        counts = self.offsets[nodes + 1] - starts
+        # the slots of the edges of nodes[i] are starts[i], starts[i] + 1, ..., starts[i] + counts[i] - 1
+        slots = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return np.repeat(nodes, counts), slots
+
+    def reverse(self) -> "CSRGraph":
+        """
+        returns the graph with every edge u -> v replaced by v -> u
+        """
+        sources, targets, weights = self.edge_arrays()
+        return CSRGraph.from_edges(self.n, targets, sources, weights)
+
+    def to_adj_list(self) -> list[list[int]] | list[list[tuple[int,int]]]:
+        return [self[u] for u in range(self.n)]
+
+
+def edges_of(adj_list):
+    """
+    return: a function u -> the out-edges of u, adj_list.__getitem__ for a list of lists and CSRGraph.out for a CSRGraph
+    """
+    return adj_list.out if isinstance(adj_list, CSRGraph) else adj_list.__getitem__
+
+
+def main():
+    # the graph from graphs/kruskal.py, as an undirected weighted graph
+    n = 8
+    a = [0, 0, 0, 0, 1, 2, 3, 3, 3, 3]
+    b = [2, 4, 3, 5, 4, 5, 4, 5, 7, 6]
+    w = [30, 1, 4, 100, 5, 2, 3, 1, 2, 4]
+    graph = CSRGraph.from_edges(n, a, b, w, directed=False)
+    print("offsets:", graph.offsets)
+    print("targets:", graph.targets)
+    print("weights:", graph.weights)
+    for u in range(graph.n):
+        print(u, "->", graph[u])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,37 +1,29 @@
-adj_list = []
-visited = []
+from dfs_engine import DepthFirstSearch
+from graph_loader import read_graph
 
-current_connected_component = []
 
-# depth-first search
-def dfs(node: int):
-    current_connected_component.append(node)
-    visited[node] = True 
-    for neighbor in adj_list[node]:
-        if not visited[neighbor]:
-            dfs(neighbor)
+def connected_components(adj_list) -> list[list[int]]:
+    """
+    adj_list[u] is the list of neighbors of u (undirected graph)
+    return: the list of connected components, each one given by its nodes in depth-first order
+    """
+    search = DepthFirstSearch(adj_list)
+    components = []
+    for node in range(len(adj_list)):
+        start = search.n_preorder
+        if search.search(node) > 0: # this will expand through the connected component of that node
+            components.append(search.preorder_nodes(start))
+    return components
+
 
 def main():
-    global adj_list, visited
-    n_nodes, n_edges = map(int, input().split())
+    # "n_nodes n_edges" and then the edges "a b", a and b are a pair of vertices that are adjacent
     # assume the nodes are indexed from 0 to n_nodes - 1
-    
-    adj_list = [[] for _ in range(n_nodes)] # initially, every node has an empty list of neighbors
-    visited = [False for _ in range(n_nodes)] # initially, every node isn't visited
-    
-    
-    # reading all the edges
-    for _ in range(n_edges):
-        a, b = map(int, input().split()) # a and b are a pair of vertices that are adjacent
-        adj_list[a].append(b)
-        adj_list[b].append(a) # this is only if the graph is undirected (bidirectional)
-    
-    for node in range(n_nodes):
-        if not visited[node]:
-            current_connected_component.clear() # I'm resetting to empty the list of nodes in the current node 
-            dfs(node) # this will expand thruogh the connected component of that node
-            print("connected component:", current_connected_component)
-        
-            
+    adj_list = read_graph(directed=False) # the graph is undirected (bidirectional)
+
+    for current_connected_component in connected_components(adj_list):
+        print("connected component:", current_connected_component)
+
+
 if __name__ == '__main__':
     main()
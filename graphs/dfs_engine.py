@@ -0,0 +1,104 @@
+from array import array
+
+from csr_graph import edges_of
+
+
+class DepthFirstSearch:
+    """
+    depth-first search with an explicit stack, so the Python call stack never grows with the depth of the graph
+
+    adj_list[u] is the list of neighbors of u (unweighted)
+
+    the buffers are allocated once and reused by every search:
+        visited[u]: 1 if u has been reached
+        parent[u]: the node from which u was reached (-1 for the roots)
+        preorder[0 .. n_preorder - 1]: the nodes in the order they were reached
+        postorder[0 .. n_postorder - 1]: the nodes in the order they were finished
+    reset() clears them, so the same object can run many independent searches
+    """
+
+    def __init__(self, adj_list):
+        self.adj_list = adj_list
+        self.n = len(adj_list)
+        self.visited = bytearray(self.n)
+        self.parent = array('q', [-1]) * self.n
+        self.preorder = array('q', [0]) * self.n
+        self.postorder = array('q', [0]) * self.n
+        self.n_preorder = 0
+        self.n_postorder = 0
+
+    def reset(self):
+        self.visited[:] = bytes(self.n)
+        self.n_preorder = 0
+        self.n_postorder = 0
+
+    def search(self, source: int, pre=None, post=None, visited_edge=None) -> int:
+        """
+        source: the node where the search starts (nothing happens if it is already visited)
+        pre(node, parent): called when node is reached for the first time (parent is -1 for the source)
+        post(node, parent): called when every neighbor of node has been explored
+        visited_edge(node, neighbor): called for every edge node -> neighbor whose neighbor was already reached
+            (in undirected graphs this includes the edge back to the parent)
+
+        return: the number of nodes reached by this search
+        """
+        visited = self.visited
+        if visited[source]:
+            return 0
+        out = edges_of(self.adj_list)
+        parent = self.parent
+        preorder = self.preorder
+        postorder = self.postorder
+        start = self.n_preorder
+
+        visited[source] = 1
+        parent[source] = -1
+        preorder[self.n_preorder] = source
+        self.n_preorder += 1
+        if pre is not None:
+            pre(source, -1)
+
+        # the stack holds the nodes of the current path, each one with the iterator over its remaining neighbors
+        nodes = [source]
+        iterators = [iter(out(source))]
+        while nodes:
+            node = nodes[-1]
+            for neighbor in iterators[-1]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parent[neighbor] = node
+                    preorder[self.n_preorder] = neighbor
+                    self.n_preorder += 1
+                    if pre is not None:
+                        pre(neighbor, node)
+                    nodes.append(neighbor)
+                    iterators.append(iter(out(neighbor)))
+                    break # go deeper, the iterator of node remembers where to continue
+                if visited_edge is not None:
+                    visited_edge(node, neighbor)
+            else:
+                # every neighbor of node has been explored
+                nodes.pop()
+                iterators.pop()
+                postorder[self.n_postorder] = node
+                self.n_postorder += 1
+                if post is not None:
+                    post(node, parent[node])
+        return self.n_preorder - start
+
+    def search_all(self, pre=None, post=None, visited_edge=None, root=None):
+        """
+        runs search() from every node that is still not visited, in increasing order of label
+        root(node): called before starting the search of a new tree rooted at node
+        """
+        for node in range(self.n):
+            if not self.visited[node]:
+                if root is not None:
+                    root(node)
+                self.search(node, pre, post, visited_edge)
+
+    def preorder_nodes(self, start: int = 0) -> list[int]:
+        return self.preorder[start : self.n_preorder].tolist()
+
+    def postorder_nodes(self, start: int = 0) -> list[int]:
+        return self.postorder[start : self.n_postorder].tolist()
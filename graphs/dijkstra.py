@@ -1,10 +1,13 @@
+from csr_graph import CSRGraph, edges_of
+from graph_loader import read_graph
 
 
-def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[int]:
+def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, target: int | None = None) -> list[int]:
     """
     n: number of vertices 
     source: source vertex
     adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
+    target: if given, stops as soon as the shortest path to target is known
     return: a list prev[] where prev[u] indicates what's the previous vertex on the optimal path from source to u
     
     runs a greedy algorithm that always retrieves the unprocessed vertex with the least d, and relax the edges
@@ -13,6 +16,8 @@ def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[
     distance = [float("inf") for _ in range(n)]
     distance[source] = 0
     processed = [False for _ in range(n)]
+    prev = [None for _ in range(n)]
+    out = edges_of(adj_list)
     
     for _ in range(n):
         # find the unprocessed vertex with the least distance
@@ -26,24 +31,25 @@ def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[
             break      
             
         processed[u] = True 
+        if u == target: # its distance won't change anymore
+            break
         
-        for v, w in adj_list[u]:
+        for v, w in out(u):
             if distance[v] > distance[u] + w:
                 distance[v] = distance[u] + w 
+                prev[v] = u 
         
     print(distance)
+    return prev
 
 def main():
-    n, m = map(int, input().split()) # num of vertices and edges respectively
-    # assume that the vertices are labeled from 0 to n - 1
-    adj_list = [[] for _ in range(n)] # initially, each vertex has 0 neighbors
+    # input: "n m" (num of vertices and edges respectively), then m lines "u v w",
+    # a directed edge u -> v with weight = w. The vertices are labeled from 0 to n - 1
+    adj_list = read_graph(weighted=True) # read in one go, straight into a CSRGraph
+    n = adj_list.n
     
-    # read the edges (directed edges)
-    for _ in range(m):
-        u, v, w = map(int, input().split()) # a directed edge u -> v with weight = w
-        adj_list[u].append((v, w)) # v is a neighbor of u and the edge has weight w 
-    
-    dijkstra(n, 0, adj_list)
+    prev = dijkstra(n, 0, adj_list)
+    print(prev)
     
     
     
@@ -1,18 +1,44 @@
 
 import heapq
 
-def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[int]:
+from csr_graph import CSRGraph, edges_of
+from graph_loader import read_graph
+from indexed_heap import IndexedHeap
+
+
+def shortest_paths(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, indexed: bool = False, d: int = 4, target: int | None = None) -> tuple[list[int], list[int]]:
     """
     n: number of vertices 
     source: source vertex
     adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
-    return: a list prev[] where prev[u] indicates what's the previous vertex on the optimal path from source to u
+    indexed: if True, uses an IndexedHeap (d-ary, with decrease-key) instead of heapq
+    target: if given, stops as soon as target is extracted from the queue (its distance is final then)
+    return: (distance, prev), where distance[u] is the length of the shortest path from source to u
+        and prev[u] indicates what's the previous vertex on the optimal path from source to u
     
     runs a greedy algorithm that always retrieves the unprocessed vertex with the least d, and relax the edges
     """
     
     distance = [float("inf") for _ in range(n)]
     distance[source] = 0
+    prev = [None for _ in range(n)]
+    out = edges_of(adj_list)
+    
+    if indexed:
+        # every vertex is in the queue at most once: a relaxation decreases its key in place
+        queue = IndexedHeap(n, d)
+        queue.push(source, 0)
+        while len(queue) > 0:
+            u, _ = queue.pop()
+            if u == target:
+                break
+            for v, w in out(u):
+                if distance[v] > distance[u] + w:
+                    distance[v] = distance[u] + w 
+                    prev[v] = u 
+                    queue.push_or_decrease(v, distance[v])
+        return distance, prev
+    
     processed = [False for _ in range(n)]
     
     priority_queue = [(distance[source], source)]
@@ -26,25 +52,34 @@ def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]]) -> list[
             continue
                     
         processed[u] = True 
+        if u == target:
+            break
         
-        for v, w in adj_list[u]:
+        for v, w in out(u):
             if distance[v] > distance[u] + w:
                 distance[v] = distance[u] + w 
+                prev[v] = u 
                 heapq.heappush(priority_queue, (distance[v], v))
         
+    return distance, prev
+
+def dijkstra(n: int, source: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, indexed: bool = False, target: int | None = None) -> list[int]:
+    """
+    prints the distances from source to every vertex (see shortest_paths)
+    return: a list prev[] where prev[u] indicates what's the previous vertex on the optimal path from source to u
+    """
+    distance, prev = shortest_paths(n, source, adj_list, indexed, target=target)
     print(distance)
+    return prev
 
 def main():
-    n, m = map(int, input().split()) # num of vertices and edges respectively
-    # assume that the vertices are labeled from 0 to n - 1
-    adj_list = [[] for _ in range(n)] # initially, each vertex has 0 neighbors
-    
-    # read the edges (directed edges)
-    for _ in range(m):
-        u, v, w = map(int, input().split()) # a directed edge u -> v with weight = w
-        adj_list[u].append((v, w)) # v is a neighbor of u and the edge has weight w 
+    # input: "n m" (num of vertices and edges respectively), then m lines "u v w",
+    # a directed edge u -> v with weight = w. The vertices are labeled from 0 to n - 1
+    adj_list = read_graph(weighted=True) # read in one go, straight into a CSRGraph
+    n = adj_list.n
     
-    dijkstra(n, 0, adj_list)
+    prev = dijkstra(n, 0, adj_list)
+    print(prev)
     
     
     
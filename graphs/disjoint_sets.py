@@ -0,0 +1,184 @@
+from array import array
+
+import numpy as np
+
+
+class DisjointSets:
+    """
+    disjoint sets (union-find) over the elements 0 .. n - 1, stored in two flat integer arrays:
+        parent[a]: the parent of a in the tree of its set (the root is the representative, parent[root] = root)
+        size[root]: the number of elements in the set of root (only meaningful for roots)
+
+    find uses path halving and join hangs the smaller tree under the larger one (union by size),
+    so every operation takes O(alpha(n)) amortized time
+
+    parent and size are array.array buffers (fast to index from Python), and parent_view / size_view are
+    NumPy views of the same memory, used by the batch operations find_many and union_many
+    """
+
+    def __init__(self, n: int):
+        """
+        starting n sets of size 1 each
+        """
+        self.parent = array('q', bytes(8 * n))
+        self.parent_view = np.frombuffer(self.parent, dtype=np.int64) if n > 0 else np.zeros(0, dtype=np.int64)
+        self.parent_view[:] = np.arange(n) # parent[a] = a for every a from 0 to n - 1
+        self.size = array('q', [1]) * n
+        self.size_view = np.frombuffer(self.size, dtype=np.int64) if n > 0 else np.zeros(0, dtype=np.int64)
+        self.component_count = n
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, a: int) -> int:
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]] # path halving: skip a level on the way up
+            a = parent[a]
+        return a
+
+    def check(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def join(self, a: int, b: int) -> bool:
+        """
+        we want to take the set where a is and the set where b is and merge them into a single set
+        return: False if they were already in the same set
+        """
+        ra = self.find(a)
+        rb = self.find(b)
+        if ra == rb: # they're already in the same set, so we don't do anything
+            return False
+        size = self.size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        # the smaller set goes under the root of the larger one
+        self.parent[rb] = ra
+        size[ra] += size[rb]
+        self.component_count -= 1
+        return True
+
+    def set_size(self, a: int) -> int:
+        return self.size[self.find(a)]
+
+    def find_many(self, elements: np.ndarray) -> np.ndarray:
+        """
+        returns the representative of every element of the array, and compresses their paths
+        """
+        parent = self.parent_view
+        elements = np.asarray(elements, dtype=np.int64)
+        roots = parent[elements]
+        while True:
+            up = parent[roots]
+            if np.array_equal(up, roots):
+                break
+            roots = up
+        parent[elements] = roots # every queried element now points straight to its root
+        return roots
+
+    def union_many(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        joins a[i] and b[i] for every i, in order
+        return: a boolean array, True where the join actually merged two sets
+
+        the pairs that are already in the same set are filtered out with one vectorized find_many,
+        and only the rest go through join (the order matters for union by size, so they're joined one by one)
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        merged = np.zeros(len(a), dtype=bool)
+        candidates = np.flatnonzero(self.find_many(a) != self.find_many(b))
+        join = self.join
+        for i, x, y in zip(candidates.tolist(), a[candidates].tolist(), b[candidates].tolist()):
+            merged[i] = join(x, y)
+        return merged
+
+    def sets(self) -> list[list[int]]:
+        """
+        returns every set as a list of its elements
+        """
+        roots = self.find_many(np.arange(len(self)))
+        order = np.argsort(roots, kind='stable')
+        boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+        return [group.tolist() for group in np.split(order, boundaries)] if len(self) > 0 else []
+
+
+def component_roots(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    n: number of elements, a, b: the pairs (a[i], b[i]) to join
+    return: roots[x], the least element of the set of x once every pair is joined
+
+    vectorized union-find: every round hooks the larger root of each pair under the smaller one,
+    then jumps the pointers until every element points to its root, and drops the pairs already inside a set
+    """
+    parent = np.arange(n)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    while len(a) > 0:
+        root_a, root_b = parent[a], parent[b]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        different = parent[a] != parent[b]
+        a, b = a[different], b[different]
+    return parent
+
+
+class ParityDisjointSets:
+    """
+    disjoint sets that also know the parity (0 or 1) of every element relative to the others of its set,
+    like a 2-coloring that is built as constraints "a and b have equal / different parity" arrive
+
+    parent[a], size[root]: as in DisjointSets (union by size)
+    parity[a]: the parity of a relative to parent[a]; the parity of a relative to its root is the xor along the path
+    find compresses the whole path (and fixes the parities on it), so operations take O(alpha(n)) amortized
+    """
+
+    def __init__(self, n: int):
+        self.parent = array('q', range(n))
+        self.size = array('q', [1]) * n
+        self.parity = bytearray(n)
+        self.component_count = n
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, a: int) -> tuple[int, int]:
+        """
+        return: (root of a, parity of a relative to the root)
+        """
+        parent, parity = self.parent, self.parity
+        path = []
+        while parent[a] != a:
+            path.append(a)
+            a = parent[a]
+        root = a
+        # from the top of the path down, every node gets hung directly from the root
+        above = 0 # the parity of the parent of the current node relative to the root
+        for node in reversed(path):
+            above ^= parity[node]
+            parity[node] = above
+            parent[node] = root
+        return root, (parity[path[0]] if path else 0)
+
+    def join(self, a: int, b: int, odd: int = 1) -> bool:
+        """
+        adds the constraint parity(a) xor parity(b) == odd (odd = 1: different parity, as the endpoints of an edge)
+        return: False if it contradicts the constraints that are already there (then nothing changes)
+        """
+        ra, pa = self.find(a)
+        rb, pb = self.find(b)
+        if ra == rb:
+            return pa ^ pb == odd
+        size = self.size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        # the smaller set goes under the root of the larger one, with the parity that satisfies the constraint
+        self.parent[rb] = ra
+        self.parity[rb] = pa ^ pb ^ odd
+        size[ra] += size[rb]
+        self.component_count -= 1
+        return True
@@ -0,0 +1,256 @@
+import sys
+from heapq import heappop, heappush
+from random import Random
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra_heap import shortest_paths
+from graph_loader import edges_from_ints, read_ints
+from indexed_heap import IndexedHeap
+
+
+class DynamicShortestPaths:
+    """
+    shortest paths from a fixed source that are repaired, instead of recomputed, when the weight of an edge changes
+    (in the spirit of Ramalingam-Reps dynamic SSSP; the weights must be non-negative)
+
+    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
+        (the edges are copied, so the graph can be modified only through here)
+
+    distance[u]: the length of a shortest path from source to u (inf if unreachable)
+    prev[u]: the previous vertex on that path (None for the source and the unreachable vertices)
+    prev_slot[u]: the edge prev[u] -> u that the path uses (its position in the CSR arrays, -1 if there is none)
+
+    the prev_slot edges form the shortest path tree, and a change only affects:
+        a decrease of u -> v: the vertices whose path gets shorter through u -> v, found by a Dijkstra that starts at v
+            and only goes on from the vertices that improved
+        an increase of a tree edge u -> v: the affected vertices (Ramalingam-Reps), found from v down the tree in
+            order of distance: a vertex is affected when it has no other tight in-edge p -> x (distance[p] + w ==
+            distance[x]) from a vertex p known to be unaffected, and only the tree children of the affected vertices
+            are examined; those lose their distance, take the best in-edge from the unaffected vertices and run
+            a Dijkstra among themselves (an increase of an edge outside the tree changes nothing)
+    so the work is proportional to the vertices whose distance changes (and their edges), not to the whole graph
+    (with edges of weight 0 a few vertices whose distance stays the same can be affected too: a tight in-edge from
+    a vertex at the same distance only counts once that vertex is known to be unaffected)
+    last_touched: the number of vertices that the last update had to process
+    """
+
+    def __init__(self, adj_list, source: int):
+        graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+        assert graph.weights is not None, 'the graph must be weighted'
+        self.n = graph.n
+        self.source = source
+        self.offsets = graph.offsets.tolist()
+        self.targets = graph.targets.tolist()
+        self.weights = graph.weights.tolist()
+        # the in-edges of every vertex, as the slots of the edges in the arrays above
+        heads = graph.targets.astype(np.int64)
+        by_head = np.argsort(heads, kind='stable')
+        self.in_offsets = np.concatenate(([0], np.cumsum(np.bincount(heads, minlength=self.n)))).tolist()
+        self.in_slots = by_head.tolist()
+        sources, _, _ = graph.edge_arrays()
+        self.tails = sources.tolist()
+
+        self.distance = [float("inf")] * self.n
+        self.prev = [None] * self.n
+        self.prev_slot = [-1] * self.n
+        self.queue = IndexedHeap(self.n)
+        # only set during an update, so they are never cleared in O(n)
+        self.affected = bytearray(self.n)
+        self.unaffected = bytearray(self.n)
+        self.distance[source] = 0
+        self.last_touched = self._relax_from([source])
+
+    def _relax_from(self, start: list[int], inside=None) -> int:
+        """
+        Dijkstra from the vertices of start, whose distance is already set (and better than before)
+        inside: if given, only the vertices for which inside[v] is true can improve
+        return: the number of vertices extracted from the queue
+        """
+        distance, prev, prev_slot = self.distance, self.prev, self.prev_slot
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        queue = self.queue
+        for u in start:
+            queue.push_or_decrease(u, distance[u])
+        extracted = 0
+        while len(queue) > 0:
+            u, _ = queue.pop()
+            d_u = distance[u] # the key of the heap is a float, the distance keeps the type of the weights
+            extracted += 1
+            for slot in range(offsets[u], offsets[u + 1]):
+                v = targets[slot]
+                if d_u + weights[slot] < distance[v] and (inside is None or inside[v]):
+                    distance[v] = d_u + weights[slot]
+                    prev[v] = u
+                    prev_slot[v] = slot
+                    queue.push_or_decrease(v, distance[v])
+        return extracted
+
+    def _affected_below(self, root: int) -> tuple[list[int], int]:
+        """
+        after an increase of the tree edge into root: marks in self.affected the vertices whose path is lost
+        (root, and the tree children of affected vertices that have no other tight in-edge from an unaffected vertex);
+        the other vertices examined switch their prev to that tight in-edge
+        return: (the affected vertices, the number of vertices examined)
+
+        the vertices are examined in order of distance, so a tight in-edge from a smaller distance comes from a vertex
+        that is already decided; one from the same distance (an edge of weight 0) only counts if its tail was
+        examined and found unaffected
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        in_offsets, in_slots, tails = self.in_offsets, self.in_slots, self.tails
+        distance, prev, prev_slot = self.distance, self.prev, self.prev_slot
+        affected, unaffected = self.affected, self.unaffected
+        found, examined = [], []
+        queue = [(distance[root], root)] # every vertex has one parent in the tree, so it's pushed at most once
+        while queue:
+            d_x, x = heappop(queue)
+            examined.append(x)
+            for in_slot in in_slots[in_offsets[x] : in_offsets[x + 1]]:
+                p = tails[in_slot]
+                if (not affected[p] and distance[p] + weights[in_slot] == d_x
+                        and (distance[p] < d_x or unaffected[p])):
+                    unaffected[x] = 1
+                    prev[x] = p
+                    prev_slot[x] = in_slot
+                    break
+            else:
+                affected[x] = 1
+                found.append(x)
+                for slot in range(offsets[x], offsets[x + 1]):
+                    if prev_slot[targets[slot]] == slot:
+                        heappush(queue, (distance[targets[slot]], targets[slot]))
+        for x in examined:
+            unaffected[x] = 0
+        return found, len(examined)
+
+    def edge_slot(self, u: int, v: int) -> int:
+        """
+        return: the position of the edge u -> v (the first one, if there are parallel edges)
+        """
+        for slot in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[slot] == v:
+                return slot
+        raise KeyError(f'there is no edge {u} -> {v}')
+
+    def set_weight(self, u: int, v: int, w: float) -> int:
+        """
+        changes the weight of the edge u -> v to w (w >= 0) and repairs the distances
+        return: the number of vertices that were processed
+        """
+        return self.update_slot(self.edge_slot(u, v), w)
+
+    def update_slot(self, slot: int, w: float) -> int:
+        """
+        same as set_weight, with the edge given by its position
+        """
+        assert w >= 0, 'the weights must be non-negative'
+        old = self.weights[slot]
+        self.weights[slot] = w
+        u, v = self.tails[slot], self.targets[slot]
+        distance = self.distance
+        if w < old:
+            if distance[u] + w < distance[v]:
+                distance[v] = distance[u] + w
+                self.prev[v] = u
+                self.prev_slot[v] = slot
+                self.last_touched = self._relax_from([v])
+            else:
+                self.last_touched = 0
+            return self.last_touched
+        if w == old or self.prev_slot[v] != slot:
+            self.last_touched = 0
+            return 0
+
+        # the affected vertices lose their distance, take for now their best in-edge from the unaffected ones
+        # (whose distances can't change), and Dijkstra settles the rest among them
+        found, examined = self._affected_below(v)
+        affected = self.affected
+        for x in found:
+            distance[x] = float("inf")
+            self.prev[x] = None
+            self.prev_slot[x] = -1
+        tails, weights = self.tails, self.weights
+        start = []
+        for x in found:
+            for in_slot in self.in_slots[self.in_offsets[x] : self.in_offsets[x + 1]]:
+                p = tails[in_slot]
+                if not affected[p] and distance[p] + weights[in_slot] < distance[x]:
+                    distance[x] = distance[p] + weights[in_slot]
+                    self.prev[x] = p
+                    self.prev_slot[x] = in_slot
+            if distance[x] < float("inf"):
+                start.append(x)
+        self._relax_from(start, inside=affected)
+        for x in found:
+            affected[x] = 0
+        self.last_touched = examined
+        return self.last_touched
+
+    def path(self, target: int) -> list[int] | None:
+        """
+        return: the vertices of a shortest path from source to target, or None if target is unreachable
+        """
+        if self.distance[target] == float("inf"):
+            return None
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self.prev[path[-1]])
+        path.reverse()
+        return path
+
+
+def stress_test(rounds: int = 200, n: int = 30, m: int = 90, changes: int = 50, seed: int = 0):
+    """
+    random graphs and random weight changes (increases and decreases): after every change, the repaired distances
+    must be the ones of a full dijkstra_heap.shortest_paths, and prev must form shortest paths
+    the weights are 0..10 (zero weights included) and then 1..2 (many ties, many vertices with several tight in-edges),
+    where every vertex examined must be the head of the changed edge or a child of one whose distance changed
+    """
+    rng = Random(seed)
+    for low, high in ((0, 10), (1, 2)):
+        for _ in range(rounds):
+            a = [rng.randrange(n) for _ in range(m)]
+            b = [rng.randrange(n) for _ in range(m)]
+            w = [rng.randint(low, high) for _ in range(m)]
+            graph = CSRGraph.from_edges(n, a, b, w)
+            paths = DynamicShortestPaths(graph, 0)
+            for _ in range(changes):
+                slot = rng.randrange(m)
+                before = paths.distance.copy()
+                paths.update_slot(slot, rng.randint(low, high))
+                graph.weights[slot] = paths.weights[slot]
+                expected, _ = shortest_paths(n, 0, graph)
+                assert paths.distance == expected, (paths.distance, expected)
+                for v in range(n):
+                    if paths.prev[v] is not None:
+                        slot_v = paths.prev_slot[v]
+                        assert paths.tails[slot_v] == paths.prev[v] and paths.targets[slot_v] == v
+                        assert paths.distance[paths.prev[v]] + paths.weights[slot_v] == paths.distance[v]
+                if low > 0:
+                    changed = [v for v in range(n) if paths.distance[v] != before[v]]
+                    bound = 1 + sum(paths.offsets[v + 1] - paths.offsets[v] for v in changed)
+                    assert paths.last_touched <= bound, (paths.last_touched, bound)
+    print("All correct!")
+
+
+def main():
+    # input: "n m" and then m lines "u v w" (a directed edge u -> v with weight w), then "q" and q lines "u v w":
+    # the weight of the edge u -> v becomes w, and the distances from 0 are printed after every change
+    # usage: python dynamic_shortest_paths.py [--stress] (with --stress there is no input, it runs stress_test)
+    if '--stress' in sys.argv[1:]:
+        stress_test()
+        return
+    values = read_ints()
+    m = int(values[1])
+    n, a, b, w = edges_from_ints(values[: 2 + 3 * m], weighted=True)
+    paths = DynamicShortestPaths(CSRGraph.from_edges(n, a, b, w), 0)
+    print(paths.distance)
+    for u, v, w in values[2 + 3 * m + 1 :].reshape(-1, 3).tolist():
+        paths.set_weight(u, v, w)
+        print(paths.distance)
+
+
+if __name__ == '__main__':
+    main()
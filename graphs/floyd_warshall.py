@@ -1,65 +1,172 @@
+import sys
+from random import Random
 
+import numpy as np
 
-def floyd_warshall(n: int, adj_list: list[list[tuple[int,int]]]) -> list[int]:
+from csr_graph import CSRGraph
+from graph_loader import read_graph
+
+
+def initial_matrices(n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, out: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    return: (distance, next_hop), where distance[u, v] = w for the edges u->v (the least w for parallel edges),
+        distance[u, u] = 0 and inf otherwise; next_hop[u, v] = v if distance[u, v] is finite, -1 otherwise
+    out: if given, distance is a float64 memory-mapped file at that path instead of an array in RAM
+    """
+    if out is None:
+        distance = np.full((n, n), np.inf)
+    else:
+        distance = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64, shape=(n, n))
+        distance[:] = np.inf
+
+    if not isinstance(adj_list, CSRGraph):
+        adj_list = CSRGraph.from_adj_list(adj_list)
+    sources, targets, weights = adj_list.edge_arrays()
+    if weights is not None: # (a graph without edges has no weights)
+        np.minimum.at(distance, (sources, targets), weights.astype(np.float64))
+    np.fill_diagonal(distance, np.minimum(np.diagonal(distance), 0))
+
+    next_hop = np.where(distance < np.inf, np.arange(n, dtype=np.int32)[None, :], np.int32(-1)).astype(np.int32)
+    return distance, next_hop
+
+
+def relax_through(distance: np.ndarray, next_hop: np.ndarray, i: int, rows: slice, cols: slice, hops: np.ndarray | None = None):
     """
-    n: number of vertices 
+    distance[u, v] = min(distance[u, v], distance[u, i] + distance[i, v]) for u in rows and v in cols, in place
+    (and the paths that improve now start like the path u -> i)
+    hops: if given, the number of edges of every path, and a path with the same distance but fewer edges
+        is an improvement too
+    """
+    through = distance[rows, i, None] + distance[None, i, cols] # one broadcasted sum for the whole tile
+    improved = through < distance[rows, cols]
+    if hops is not None:
+        hops_through = hops[rows, i, None] + hops[None, i, cols]
+        improved |= (through == distance[rows, cols]) & (hops_through < hops[rows, cols])
+        np.copyto(hops[rows, cols], hops_through, where=improved)
+    np.copyto(distance[rows, cols], through, where=improved)
+    np.copyto(next_hop[rows, cols], np.broadcast_to(next_hop[rows, i, None], improved.shape), where=improved)
+
+
+def floyd_warshall(n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, block_size: int | None = None, out: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    n: number of vertices
     adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
-    return: a 2D array parent[u,v] : an intermediate vertex in the optimal path from u to v 
+        (negative weights are fine, negative cycles are not)
+    block_size: if given, runs the cache-blocked (tiled) version with tiles of block_size x block_size
+    out: if given, the distance matrix is written to a memory-mapped .npy file at that path
+    return: (distance, next_hop), where distance[u, v] is the length of the shortest path from u to v (inf if there's none)
+        and next_hop[u, v] is the vertex that comes after u in that path (see reconstruct_path)
     """
-    
-    distance = [
-            [float("inf") for _ in range(n)]
-        for _ in range(n)
-    ] # initially, d[u,v] = inf for every pair u,v
-    
-    parent = [
-            [None for _ in range(n)]
-        for _ in range(n)
-    ] # which intermediate vertex i to take so that we go u->...->i->...->v
-    
-    # for the edges u->v with weight w, set the distance to be w 
-    for u in range(n):
-        for v, w in adj_list[u]:
-            distance[u][v] = w 
-            parent[u][v] = u 
-            
-    # distance[u][u] = 0
-    for u in range(n):
-        distance[u][u] = 0
-        parent[u][u] = u
-        
-    for i in range(n):
-        for u in range(n):
-            for v in range(n):
-                if distance[u][v] > distance[u][i] + distance[i][v]:
-                    distance[u][v] = distance[u][i] + distance[i][v]
-                    # parent[u][v] = something.... #TODO
-                    
-    return parent 
-    
+    distance, next_hop = initial_matrices(n, adj_list, out)
+    everything = slice(0, n)
+
+    if block_size is None:
+        # allow the vertex i as an intermediate vertex of every path, for i = 0, 1, ..., n - 1
+        for i in range(n):
+            relax_through(distance, next_hop, i, everything, everything)
+        return distance, next_hop
+
+    # in phases 2 and 3 distance[u, i] already goes through the later pivots of the tile, so with plain distances
+    # two pointers can lead to each other along a cycle of weight 0; comparing (distance, number of edges) instead
+    # makes every cycle cost something, and every next_hop[u, v] then points to a vertex closer to v
+    # (only needed if there can be cycles of weight 0, that is, if some weight is not positive)
+    hops = None
+    diagonal = np.diagonal(distance).copy()
+    np.fill_diagonal(distance, np.inf)
+    lightest = distance.min(initial=np.inf)
+    np.fill_diagonal(distance, diagonal)
+    if lightest <= 0:
+        hops = np.where(distance < np.inf, 1, n).astype(np.int32)
+        np.fill_diagonal(hops, 0)
+    blocks = [slice(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+    for pivot in blocks:
+        # phase 1: the diagonal tile only uses itself
+        for i in range(pivot.start, pivot.stop):
+            relax_through(distance, next_hop, i, pivot, pivot, hops)
+        # phase 2: the tiles in the same row or column as the pivot tile depend only on it and themselves
+        for block in blocks:
+            if block == pivot:
+                continue
+            for i in range(pivot.start, pivot.stop):
+                relax_through(distance, next_hop, i, pivot, block, hops)
+                relax_through(distance, next_hop, i, block, pivot, hops)
+        # phase 3: every other tile combines its row tile and its column tile from phase 2
+        for rows in blocks:
+            if rows == pivot:
+                continue
+            for cols in blocks:
+                if cols == pivot:
+                    continue
+                for i in range(pivot.start, pivot.stop):
+                    relax_through(distance, next_hop, i, rows, cols, hops)
+    return distance, next_hop
+
+
+def reconstruct_path(next_hop: np.ndarray, u: int, v: int) -> list[int] | None:
+    """
+    return: the vertices of the shortest path from u to v, or None if v can't be reached from u
+    """
+    if next_hop[u, v] == -1:
+        return None
+    path = [u]
+    while u != v:
+        if len(path) > len(next_hop):
+            raise ValueError(f'next_hop has a cycle on the way to {v}')
+        u = int(next_hop[u, v])
+        path.append(u)
+    return path
+
+
+def stress_test(rounds: int = 1000, seed: int = 0):
+    """
+    random graphs with many ties (weights w + h[u] - h[v] with w in 0..3, so there are zero and negative weights
+    but no negative cycles): for the plain and the tiled versions, every path of reconstruct_path must exist
+    and have the length in distance
+    """
+    rng = Random(seed)
+    for _ in range(rounds):
+        n = rng.randint(2, 12)
+        m = rng.randint(0, 3 * n)
+        h = [rng.randint(0, 3) for _ in range(n)]
+        edges = {}
+        for _ in range(m):
+            u, v = rng.randrange(n), rng.randrange(n)
+            edges[u, v] = rng.randint(0, 3) + h[u] - h[v]
+        adj_list = [[] for _ in range(n)]
+        for (u, v), w in edges.items():
+            adj_list[u].append((v, w))
+        expected, _ = floyd_warshall(n, adj_list)
+        for block_size in (None, 2, 3):
+            distance, next_hop = floyd_warshall(n, adj_list, block_size=block_size)
+            assert np.array_equal(distance, expected), (block_size, distance, expected)
+            for u in range(n):
+                for v in range(n):
+                    path = reconstruct_path(next_hop, u, v)
+                    if path is None:
+                        assert distance[u, v] == np.inf
+                        continue
+                    assert path[0] == u and path[-1] == v
+                    assert sum(edges[a, b] for a, b in zip(path, path[1:])) == distance[u, v], (block_size, u, v, path)
+    print("All correct!")
+
 
 def main():
-    n, m = map(int, input().split()) # num of vertices and edges respectively
-    # assume that the vertices are labeled from 0 to n - 1
-    adj_list = [[] for _ in range(n)] # initially, each vertex has 0 neighbors
-    
-    # read the edges (directed edges)
-    for _ in range(m):
-        u, v, w = map(int, input().split()) # a directed edge u -> v with weight = w
-        adj_list[u].append((v, w)) # v is a neighbor of u and the edge has weight w 
-    
-    parent = floyd_warshall(n, adj_list)
-    
-    # given u and v, reconstruct the optimal path from u to v...
-    # TODO
-    
-    # print(parent)
-    
-    
-    
-    
+    # input: "n m" (num of vertices and edges respectively), then m lines "u v w",
+    # a directed edge u -> v with weight = w. The vertices are labeled from 0 to n - 1
+    # usage: python floyd_warshall.py [--stress] (with --stress there is no input, it runs stress_test)
+    if '--stress' in sys.argv[1:]:
+        stress_test()
+        return
+    adj_list = read_graph(weighted=True) # read in one go, straight into a CSRGraph
+    n = adj_list.n
 
-if __name__ == '__main__':
-    main()
+    distance, next_hop = floyd_warshall(n, adj_list)
 
+    # given u and v, reconstruct the optimal path from u to v
+    for u in range(n):
+        for v in range(n):
+            print(f"{u} -> {v}: distance {distance[u, v]}, path {reconstruct_path(next_hop, u, v)}")
 
+
+if __name__ == '__main__':
+    main()
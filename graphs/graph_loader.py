@@ -0,0 +1,134 @@
+import sys
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+def read_ints(stream=None) -> np.ndarray:
+    """
+    stream: a binary file-like object (sys.stdin.buffer by default)
+    return: every whitespace-separated integer in the stream, as an int64 array
+
+    reads the whole stream at once and parses it in C, instead of one input().split() per line
+    """
+    if stream is None:
+        stream = sys.stdin.buffer
+    data = stream.read()
+    return np.fromstring(data, dtype=np.int64, sep=' ')
+
+
+def edges_from_ints(values: np.ndarray, weighted: bool, with_m: bool = True) -> tuple[int, np.ndarray, np.ndarray, np.ndarray | None]:
+    """
+    values: the flat sequence "n m a_0 b_0 [w_0] a_1 b_1 [w_1] ..."
+        (or "n a_0 b_0 ..." with m = n - 1 edges if with_m is False, as in the input of a tree)
+    return: (n, a, b, w), where w is None if the edges are not weighted
+    """
+    n = int(values[0])
+    if with_m:
+        m = int(values[1])
+        start = 2
+    else:
+        m = n - 1
+        start = 1
+    width = 3 if weighted else 2
+    if len(values) < start + width * m:
+        raise ValueError(f'expected {m} edges but the input ended after {(len(values) - start) // width}')
+    edges = values[start : start + width * m].reshape(m, width)
+    weights = edges[:, 2] if weighted else None
+    return n, edges[:, 0], edges[:, 1], weights
+
+
+def read_graph(stream=None, weighted: bool = False, directed: bool = True, with_m: bool = True) -> CSRGraph:
+    """
+    stream: a binary file-like object with the usual text input
+        "n m" followed by m lines "a b" (or "a b w" if weighted)
+    return: the graph as a CSRGraph (directed: a -> b, undirected: both directions)
+    """
+    n, a, b, w = edges_from_ints(read_ints(stream), weighted, with_m)
+    return CSRGraph.from_edges(n, a, b, w, directed=directed)
+
+
+def read_edge_list(stream=None, weighted: bool = True) -> tuple[int, list[tuple[int,int,int]]]:
+    """
+    same input as read_graph, but returns (n, edges_list) with edges as tuples (a, b) or (a, b, w)
+    """
+    n, a, b, w = edges_from_ints(read_ints(stream), weighted)
+    columns = [a.tolist(), b.tolist()] if w is None else [a.tolist(), b.tolist(), w.tolist()]
+    return n, list(zip(*columns))
+
+
+def save_binary(path: str, n: int, a, b, w=None):
+    """
+    stores the edges in the binary format read by load_binary:
+        if path ends with .npy, a NumPy array of shape (m + 1, 2 or 3) whose first row is (n, m[, 0])
+        otherwise, raw int32 values "n m a_0 b_0 [w_0] ..." (the same layout as the text input)
+    """
+    columns = [a, b] if w is None else [a, b, w]
+    edges = np.column_stack([np.asarray(column, dtype=np.int32) for column in columns])
+    header = np.zeros((1, edges.shape[1]), dtype=np.int32)
+    header[0, 0], header[0, 1] = n, len(edges)
+    if path.endswith('.npy'):
+        np.save(path, np.concatenate((header, edges)))
+    else:
+        with open(path, 'wb') as file:
+            header[0, :2].tofile(file)
+            edges.tofile(file)
+
+
+def save_binary_batches(path: str, n: int, batches, weighted: bool = True) -> int:
+    """
+    same raw int32 layout as save_binary, but the edges come as an iterable of batches (a, b[, w]) of arrays,
+    so they are written as they are produced and never all held in memory
+    return: the number of edges m (written into the header at the end)
+    """
+    assert not path.endswith('.npy'), 'only the raw int32 format can be written in batches'
+    m = 0
+    with open(path, 'wb') as file:
+        np.array([n, 0], dtype=np.int32).tofile(file)
+        for columns in batches:
+            edges = np.column_stack([np.asarray(column, dtype=np.int32) for column in columns[:3 if weighted else 2]])
+            edges.tofile(file)
+            m += len(edges)
+        file.seek(0)
+        np.array([n, m], dtype=np.int32).tofile(file)
+    return m
+
+
+def load_edge_arrays(path: str, weighted: bool = False) -> tuple[int, np.ndarray, np.ndarray, np.ndarray | None]:
+    """
+    path: a file written by save_binary or save_binary_batches (.npy or raw int32)
+    return: (n, a, b, w) as memory-mapped views of the file (w is None if not weighted)
+    """
+    if path.endswith('.npy'):
+        table = np.load(path, mmap_mode='r')
+        n, m = int(table[0, 0]), int(table[0, 1])
+        edges = table[1 : m + 1]
+    else:
+        raw = np.memmap(path, dtype=np.int32, mode='r')
+        n, m = int(raw[0]), int(raw[1])
+        edges = raw[2:].reshape(m, 3 if weighted else 2)
+    weights = edges[:, 2] if weighted else None
+    return n, edges[:, 0], edges[:, 1], weights
+
+
+def load_binary(path: str, weighted: bool = False, directed: bool = True) -> CSRGraph:
+    """
+    path: a file written by save_binary (.npy or raw int32)
+    return: the graph as a CSRGraph
+
+    the file is memory-mapped, so nothing is parsed and only the CSR buffers get allocated
+    """
+    n, a, b, w = load_edge_arrays(path, weighted)
+    return CSRGraph.from_edges(n, a, b, w, directed=directed)
+
+
+def main():
+    # reads "n m" and m weighted edges from stdin and prints the adjacency of every vertex
+    graph = read_graph(weighted=True)
+    for u in range(graph.n):
+        print(u, "->", graph[u])
+
+
+if __name__ == '__main__':
+    main()
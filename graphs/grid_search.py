@@ -0,0 +1,193 @@
+import heapq
+import sys
+from array import array
+from collections import deque
+
+WALL = ord('#')
+BLOCKED = bytes(1 if c == WALL else 0 for c in range(256)) # translates the cells into 1 for walls and 0 for free cells
+
+
+class Grid:
+    """
+    an n x m maze stored as one flat bytearray, with a border of walls around it
+    (every row must have the same length m, otherwise ValueError)
+
+    the cell (row, col) is the node (row + 1) * width + (col + 1), where width = m + 2,
+    so its neighbors are node - width (UP), node + width (DOWN), node - 1 (LEFT) and node + 1 (RIGHT),
+    and the border makes sure they never leave the grid: no bounds checks and no adj_list
+    """
+
+    def __init__(self, rows: list[str] | list[bytes]):
+        self.n = len(rows)
+        self.m = len(rows[0]) if rows else 0
+        self.width = self.m + 2
+        self.cells = bytearray(b'#' * (self.width * (self.n + 2)))
+        for row, line in enumerate(rows):
+            if isinstance(line, str):
+                line = line.encode()
+            if len(line) != self.m:
+                raise ValueError(f'row {row} has {len(line)} cells, expected {self.m} (the width of row 0)')
+            start = self.node(row, 0)
+            self.cells[start : start + self.m] = line
+        # (delta, move): going from node to node + delta is the move
+        self.moves = [(-self.width, ord('U')), (self.width, ord('D')), (-1, ord('L')), (1, ord('R'))]
+
+    def node(self, row: int, col: int) -> int:
+        return (row + 1) * self.width + (col + 1)
+
+    def position(self, node: int) -> tuple[int, int]:
+        row, col = divmod(node, self.width)
+        return row - 1, col - 1
+
+    def find(self, char: str) -> int | None:
+        node = self.cells.find(char.encode())
+        return node if node != -1 else None
+
+    def neighbors(self, node: int):
+        cells = self.cells
+        for delta, _ in self.moves:
+            if cells[node + delta] != WALL:
+                yield node + delta
+
+    def moves_to(self, move: bytearray, source: int, target: int) -> str:
+        """
+        move[v] is the move that was used to reach v, so going back from target gives the path
+        return: the moves from source to target, as a string of 'U', 'D', 'L' and 'R'
+        """
+        back = {ord('U'): self.width, ord('D'): -self.width, ord('L'): 1, ord('R'): -1}
+        moves = bytearray()
+        node = target
+        while node != source:
+            moves.append(move[node])
+            node += back[move[node]]
+        moves.reverse()
+        return moves.decode()
+
+
+def bfs(grid: Grid, source: int, target: int) -> str | None:
+    """
+    return: the moves of a shortest path from source to target, or None if target can't be reached
+
+    move[] (one byte per cell) is both the visited mark and the predecessor, so the search needs ~1 byte per cell
+    (the walls start as already visited, so they never need to be checked)
+    """
+    moves = grid.moves
+    move = grid.cells.translate(BLOCKED)
+    move[source] = ord('S')
+    Q = deque([source])
+    while Q:
+        node = Q.popleft()
+        if node == target:
+            return grid.moves_to(move, source, target)
+        for delta, char in moves:
+            neighbor = node + delta
+            if not move[neighbor]:
+                move[neighbor] = char
+                Q.append(neighbor)
+    return None
+
+
+def zero_one_bfs(grid: Grid, source: int, target: int, costs: dict[str, int]) -> tuple[int, str] | None:
+    """
+    costs[char]: the cost (0 or 1) of stepping into a cell marked with char (1 for the chars not in costs)
+    return: (cost, moves) of a cheapest path from source to target, or None if target can't be reached
+
+    0-1 BFS: a deque instead of a priority queue, free steps go to the front and the others to the back
+    """
+    cells = grid.cells
+    moves = grid.moves
+    cost_of = bytes(costs.get(chr(c), 1) for c in range(256)) # a lookup table by byte value
+    INF = 2**31 - 1
+    distance = array('i', [INF]) * len(cells)
+    move = bytearray(len(cells))
+    distance[source] = 0
+    Q = deque([source])
+    while Q:
+        node = Q.popleft()
+        if node == target:
+            return distance[target], grid.moves_to(move, source, target)
+        d_node = distance[node]
+        for delta, char in moves:
+            neighbor = node + delta
+            if cells[neighbor] == WALL:
+                continue
+            step = cost_of[cells[neighbor]]
+            if d_node + step < distance[neighbor]:
+                distance[neighbor] = d_node + step
+                move[neighbor] = char
+                if step == 0:
+                    Q.appendleft(neighbor)
+                else:
+                    Q.append(neighbor)
+    return None
+
+
+def astar(grid: Grid, source: int, target: int) -> str | None:
+    """
+    return: the moves of a shortest path from source to target, or None if target can't be reached
+
+    A* with the manhattan distance to target as heuristic (it never overestimates with unit steps),
+    so the cells away from target are rarely expanded
+    """
+    cells = grid.cells
+    moves = grid.moves
+    width = grid.width
+    target_row, target_col = divmod(target, width)
+
+    def heuristic(node: int) -> int:
+        row, col = divmod(node, width)
+        return abs(row - target_row) + abs(col - target_col)
+
+    INF = 2**31 - 1
+    distance = array('i', [INF]) * len(cells)
+    move = bytearray(len(cells))
+    distance[source] = 0
+    priority_queue = [(heuristic(source), 0, source)]
+    while priority_queue:
+        _, d_node, node = heapq.heappop(priority_queue)
+        if d_node > distance[node]:
+            continue # a stale entry
+        if node == target:
+            return grid.moves_to(move, source, target)
+        for delta, char in moves:
+            neighbor = node + delta
+            if cells[neighbor] != WALL and d_node + 1 < distance[neighbor]:
+                distance[neighbor] = d_node + 1
+                move[neighbor] = char
+                heapq.heappush(priority_queue, (d_node + 1 + heuristic(neighbor), d_node + 1, neighbor))
+    return None
+
+
+def count_rooms(grid: Grid) -> int:
+    """
+    return: the number of connected components of free cells, flood-filling each one with BFS
+
+    the walls start as visited, so the next unvisited free cell is found with bytearray.find (a scan in C)
+    """
+    deltas = [delta for delta, _ in grid.moves]
+    visited = grid.cells.translate(BLOCKED)
+    rooms = 0
+    node = visited.find(0)
+    while node != -1:
+        rooms += 1
+        visited[node] = 1
+        Q = deque([node])
+        while Q:
+            current = Q.popleft()
+            for delta in deltas:
+                neighbor = current + delta
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    Q.append(neighbor)
+        node = visited.find(0, node + 1)
+    return rooms
+
+
+def read_grid(stream=None) -> Grid:
+    """
+    reads "n m" and then n rows of the maze from a binary stream (sys.stdin.buffer by default)
+    """
+    if stream is None:
+        stream = sys.stdin.buffer
+    n, m = map(int, stream.readline().split())
+    return Grid([stream.readline().rstrip(b'\r\n') for _ in range(n)])
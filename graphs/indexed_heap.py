@@ -0,0 +1,109 @@
+from array import array
+
+
+class IndexedHeap:
+    """
+    d-ary min-heap over the items 0 .. n - 1, each item is in the heap at most once with a key
+
+    heap[i]: the item stored at position i of the heap (positions 0 .. size - 1 are used)
+    position[item]: where item is stored in heap[], or -1 if it isn't in the heap
+    key[item]: the current key of item
+
+    since it knows where every item is, the key of an item can be decreased in place (decrease-key),
+    instead of pushing a duplicate entry like with heapq
+    """
+
+    def __init__(self, n: int, d: int = 4):
+        assert d >= 2, 'the heap needs at least 2 children per node'
+        self.d = d
+        self.heap = array('q', [0]) * n
+        self.position = array('q', [-1]) * n
+        self.key = array('d', [0.0]) * n
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, item: int) -> bool:
+        return self.position[item] != -1
+
+    def _sift_up(self, i: int):
+        heap, position, key, d = self.heap, self.position, self.key, self.d
+        item = heap[i]
+        item_key = key[item]
+        while i > 0:
+            parent = (i - 1) // d
+            parent_item = heap[parent]
+            if key[parent_item] <= item_key:
+                break
+            # move the parent down one level and keep going up
+            heap[i] = parent_item
+            position[parent_item] = i
+            i = parent
+        heap[i] = item
+        position[item] = i
+
+    def _sift_down(self, i: int):
+        heap, position, key, d, size = self.heap, self.position, self.key, self.d, self.size
+        item = heap[i]
+        item_key = key[item]
+        while True:
+            first_child = d * i + 1
+            if first_child >= size:
+                break
+            # find the child with the least key
+            best = first_child
+            best_key = key[heap[first_child]]
+            for child in range(first_child + 1, min(first_child + d, size)):
+                child_key = key[heap[child]]
+                if child_key < best_key:
+                    best, best_key = child, child_key
+            if item_key <= best_key:
+                break
+            # move the best child up one level and keep going down
+            heap[i] = heap[best]
+            position[heap[i]] = i
+            i = best
+        heap[i] = item
+        position[item] = i
+
+    def push(self, item: int, item_key: float):
+        assert self.position[item] == -1, 'the item is already in the heap'
+        self.key[item] = item_key
+        self.heap[self.size] = item
+        self.position[item] = self.size
+        self.size += 1
+        self._sift_up(self.size - 1)
+
+    def decrease_key(self, item: int, item_key: float):
+        assert self.position[item] != -1, 'the item is not in the heap'
+        assert item_key <= self.key[item], 'the new key must not be greater than the current one'
+        self.key[item] = item_key
+        self._sift_up(self.position[item])
+
+    def push_or_decrease(self, item: int, item_key: float):
+        """
+        inserts item with item_key, or decreases its key if it is already in the heap
+        """
+        if self.position[item] == -1:
+            self.push(item, item_key)
+        else:
+            self.decrease_key(item, item_key)
+
+    def peek(self) -> tuple[int, float]:
+        item = self.heap[0]
+        return item, self.key[item]
+
+    def pop(self) -> tuple[int, float]:
+        """
+        returns the item with the least key (and its key) and removes it from the heap
+        """
+        assert self.size > 0, 'the heap is empty'
+        item = self.heap[0]
+        self.position[item] = -1
+        self.size -= 1
+        if self.size > 0:
+            # the last item takes the place of the root and goes down to where it belongs
+            self.heap[0] = self.heap[self.size]
+            self._sift_down(0)
+        return item, self.key[item]
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from bellman_ford import bellman_ford_arrays
+from csr_graph import CSRGraph
+from dijkstra_heap import shortest_paths
+from graph_loader import read_graph
+from shared_arrays import attach_arrays, release, share_array
+
+
+def potentials(n: int, graph: CSRGraph) -> np.ndarray:
+    """
+    return: h[] such that w + h[u] - h[v] >= 0 for every edge u -> v with weight w
+
+    h[v] is the distance to v from an extra vertex (labeled n) joined to every vertex with an edge of weight 0,
+    computed with Bellman-Ford (raises NegativeCycleError if the graph has a negative cycle)
+    """
+    sources, targets, weights = graph.edge_arrays()
+    everything = np.arange(n, dtype=sources.dtype)
+    h, _ = bellman_ford_arrays(
+        n + 1, n,
+        np.concatenate((sources, np.full(n, n, dtype=sources.dtype))),
+        np.concatenate((targets, everything)),
+        np.concatenate((weights, np.zeros(n, dtype=weights.dtype))),
+    )
+    h = h[:n]
+    if np.issubdtype(weights.dtype, np.integer):
+        h = h.astype(np.int64)
+    return h
+
+
+def reweighted(n: int, graph: CSRGraph, h: np.ndarray) -> CSRGraph:
+    sources, targets, weights = graph.edge_arrays()
+    return CSRGraph(graph.offsets, targets, weights + h[sources] - h[targets])
+
+
+# in a worker process: the graph and h, attached to the shared memory of the parent (see shared_arrays.py)
+worker_graph = None
+worker_h = None
+
+
+def init_worker(offsets, targets, weights, h):
+    global worker_graph, worker_h
+    offsets, targets, weights, worker_h = attach_arrays(offsets, targets, weights, h)
+    worker_graph = CSRGraph(offsets, targets, weights)
+
+
+def rows_from(sources: list[int], graph: CSRGraph | None = None, h: np.ndarray | None = None) -> tuple[list[int], np.ndarray]:
+    """
+    runs dijkstra on the reweighted graph from every vertex of sources
+    return: (sources, rows), rows[i] are the real distances from sources[i] (inf if unreachable)
+    """
+    if graph is None:
+        graph, h = worker_graph, worker_h
+    n = graph.n
+    rows = np.empty((len(sources), n))
+    for i, source in enumerate(sources):
+        distance, _ = shortest_paths(n, source, graph)
+        # undo the reweighting: a path s -> v got h[s] - h[v] added to its length
+        rows[i] = np.array(distance, dtype=np.float64) - h[source] + h
+    return sources, rows
+
+
+def johnson_rows(n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, workers: int | None = None, chunk_size: int | None = None):
+    """
+    n: number of vertices
+    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w
+        (negative weights are fine)
+    workers: number of processes (os.cpu_count() by default); with 1, everything runs in this process
+    chunk_size: number of sources per task
+
+    yields (source, row) as soon as every row is ready (in no particular order),
+    where row[v] is the length of the shortest path from source to v
+
+    Johnson's algorithm: one Bellman-Ford to make every weight non-negative, and then dijkstra from every vertex
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    if graph.weights is None: # a graph without edges
+        graph = CSRGraph(graph.offsets, graph.targets, np.zeros(graph.m, dtype=np.int64))
+    h = potentials(n, graph)
+    graph = reweighted(n, graph, h)
+
+    workers = workers or os.cpu_count()
+    chunk_size = chunk_size or max(1, n // (4 * workers))
+    chunks = [list(range(start, min(start + chunk_size, n))) for start in range(0, n, chunk_size)]
+
+    if workers == 1:
+        for chunk in chunks:
+            sources, rows = rows_from(chunk, graph, h)
+            yield from zip(sources, rows)
+        return
+
+    blocks = []
+    try:
+        shared = [share_array(array, blocks) for array in (graph.offsets, graph.targets, graph.weights, h)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=shared) as executor:
+            futures = [executor.submit(rows_from, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                sources, rows = future.result()
+                yield from zip(sources, rows)
+    finally:
+        release(blocks)
+
+
+def johnson(n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, workers: int | None = None, out: str | None = None) -> np.ndarray:
+    """
+    return: the n x n matrix of shortest distances (see johnson_rows)
+    out: if given, the matrix is a memory-mapped .npy file at that path, filled row by row as they arrive
+    """
+    if out is None:
+        distance = np.empty((n, n))
+    else:
+        distance = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64, shape=(n, n))
+    for source, row in johnson_rows(n, adj_list, workers):
+        distance[source] = row
+    return distance
+
+
+def main():
+    # input: "n m" (num of vertices and edges respectively), then m lines "u v w",
+    # a directed edge u -> v with weight = w (possibly negative)
+    adj_list = read_graph(weighted=True)
+    n = adj_list.n
+    print(johnson(n, adj_list))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,445 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from disjoint_sets import DisjointSets
+from indexed_heap import IndexedHeap
+from shared_arrays import attach_arrays, release, shared_copy
+from tree_index import bfs_tree
+
+
+def edge_arrays(edges_list: list[tuple[int,int,int]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    converts a list of tuples (a, b, w) into the three parallel arrays a, b, w
+    """
+    if len(edges_list) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    a, b, w = zip(*edges_list)
+    return np.array(a, dtype=np.int64), np.array(b, dtype=np.int64), np.array(w)
+
+
+def join_in_order(ds: DisjointSets, a: np.ndarray, b: np.ndarray, order: np.ndarray, tree: list[int], needed: int):
+    """
+    the inner loop of Kruskal's algorithm: goes through the edges order[0], order[1], ...
+    and keeps (appends to tree) the ones joining two different sets, until tree has needed edges
+    """
+    join = ds.join
+    for i, x, y in zip(order.tolist(), a[order].tolist(), b[order].tolist()):
+        if join(x, y):
+            tree.append(i)
+            if len(tree) == needed: # early stopping
+                return
+
+
+def sort_kruskal(ds: DisjointSets, a: np.ndarray, b: np.ndarray, w: np.ndarray, tree: list[int], needed: int):
+    # a stable argsort, so edges of equal weight are taken in the order of the input
+    join_in_order(ds, a, b, np.argsort(w, kind='stable'), tree, needed)
+
+
+def filter_kruskal(ds: DisjointSets, a: np.ndarray, b: np.ndarray, w: np.ndarray, tree: list[int], needed: int, threshold: int = 1 << 14):
+    """
+    Filter-Kruskal: instead of sorting all the edges, split them around a pivot weight,
+    solve the light part first and then throw away the heavy edges whose endpoints are already connected
+    (on dense graphs most of them are), so only the edges that survive the filter are ever sorted
+
+    the chunks of edges waiting to be processed live in a stack, lightest on top;
+    every chunk is a sorted array of edge indices, so ties are still broken by input order
+    """
+    rng = np.random.default_rng(0)
+    stack = [np.arange(len(w))]
+    while len(stack) > 0 and len(tree) < needed:
+        chunk = stack.pop()
+        # filter: drop the edges that would close a cycle
+        chunk = chunk[ds.find_many(a[chunk]) != ds.find_many(b[chunk])]
+        weights = w[chunk]
+        if len(chunk) <= threshold or weights.min() == weights.max():
+            join_in_order(ds, a, b, chunk[np.argsort(weights, kind='stable')], tree, needed)
+            continue
+        # the median of a sample lies between the smallest and the largest weight, and they differ,
+        # so each of the three parts is smaller than the chunk
+        pivot = np.median(weights[rng.integers(0, len(chunk), size=min(len(chunk), 1024))])
+        light = weights < pivot
+        heavy = weights > pivot
+        for part in (heavy, ~(light | heavy), light):
+            if part.any():
+                stack.append(chunk[part])
+
+
+def kruskal_arrays(n: int, a, b, w, method: str = 'sort', forest: bool = False) -> np.ndarray:
+    """
+    n: number of nodes (labeled from 0 to n - 1)
+    a, b, w: parallel arrays, the i-th edge joins a[i] and b[i] with weight w[i] (they are not modified)
+    method: 'sort' (one argsort of all the weights) or 'filter' (Filter-Kruskal, better for dense graphs)
+    forest: if True, a disconnected graph gets a minimum spanning forest instead of an AssertionError
+
+    return: the indices of the MST edges (in the original arrays), in the order Kruskal's algorithm takes them
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    w = np.asarray(w)
+    ds = DisjointSets(n)
+    tree = []
+    needed = max(n - 1, 0)
+    if method == 'sort':
+        sort_kruskal(ds, a, b, w, tree, needed)
+    elif method == 'filter':
+        filter_kruskal(ds, a, b, w, tree, needed)
+    else:
+        raise ValueError(f'unknown method: {method}')
+
+    if len(tree) < needed and not forest:
+        raise AssertionError('the graph is not connected, hence we cannot find a minimum spanning TREE')
+    return np.array(tree, dtype=np.int64)
+
+
+def dense_cutover(n: int) -> float:
+    """
+    the average degree 2m / n from which prim_arrays switches to the dense O(n^2) variant
+
+    the dense variant costs about n NumPy passes of length n and the heap one about m Python steps,
+    so the cutover grows linearly with n; the line is fitted to the first degree at which dense wins in
+    benchmark_prim (graphs/benchmarks.py): 24 for n = 500, 32 for n = 1000, 48 for n = 2000, 96 for n = 5000
+    """
+    return 16 + n / 64
+
+
+def lightest_edges(n: int, a: np.ndarray, b: np.ndarray, w: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    return: (u, v, index), one edge per pair of adjacent nodes u < v: the lightest one among the parallel edges
+        (index is its position in the original arrays); self-loops are dropped
+    """
+    u = np.minimum(a, b)
+    v = np.maximum(a, b)
+    keep = np.flatnonzero(u != v)
+    pair = u[keep] * n + v[keep]
+    order = keep[np.lexsort((w[keep], pair))] # by pair, and by weight within a pair
+    pair = u[order] * n + v[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = pair[1:] != pair[:-1]
+    order = order[first]
+    return u[order], v[order], order
+
+
+def prim_dense(n: int, a: np.ndarray, b: np.ndarray, w: np.ndarray, forest: bool = False) -> np.ndarray:
+    """
+    Prim's algorithm without priority queue, in O(n^2) time over an n x n weight matrix
+
+    key[v] is the weight of the lightest edge between v and the tree (inf if there is none),
+    every step takes the node with the least key and updates key[] with its row of the matrix, all in NumPy
+    """
+    u, v, index = lightest_edges(n, a, b, w)
+    weight = np.full((n, n), np.inf)
+    weight[u, v] = w[index]
+    weight[v, u] = w[index]
+    edge = np.full((n, n), -1, dtype=np.int64)
+    edge[u, v] = index
+    edge[v, u] = index
+
+    key = np.full(n, np.inf)
+    best_edge = np.full(n, -1, dtype=np.int64)
+    done = np.zeros(n, dtype=bool)
+    tree = []
+    for step in range(n):
+        x = int(np.argmin(key))
+        if key[x] == np.inf: # no node out of the tree is adjacent to it, so a new tree starts
+            if step > 0 and not forest:
+                break
+            x = int(np.argmin(done))
+        else:
+            tree.append(int(best_edge[x]))
+        done[x] = True
+        key[x] = np.inf
+        row = weight[x]
+        better = (row < key) & ~done
+        key[better] = row[better]
+        best_edge[better] = edge[x, better]
+
+    if len(tree) < max(n - 1, 0) and not forest:
+        raise AssertionError('the graph is not connected, hence we cannot find a minimum spanning TREE')
+    return np.array(tree, dtype=np.int64)
+
+
+def prim_heap(n: int, a: np.ndarray, b: np.ndarray, w: np.ndarray, forest: bool = False, d: int = 4) -> np.ndarray:
+    """
+    Prim's algorithm with priority queue, in O(m log n) time:
+    the graph goes into a CSRGraph (whose weights are the indices of the edges)
+    and the nodes out of the tree wait in an IndexedHeap, keyed by their lightest edge to the tree
+    """
+    graph = CSRGraph.from_edges(n, a, b, np.arange(len(w)), directed=False)
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    edge_ids = graph.weights.tolist()
+    weights = w[graph.weights].tolist()
+
+    queue = IndexedHeap(n, d)
+    position, key = queue.position, queue.key
+    best_edge = [-1] * n
+    done = bytearray(n)
+    tree = []
+    for root in range(n):
+        if done[root]:
+            continue
+        if root > 0 and not forest: # the first tree didn't reach root
+            break
+        queue.push(root, 0.0)
+        while len(queue) > 0:
+            x, _ = queue.pop()
+            done[x] = 1
+            if best_edge[x] != -1:
+                tree.append(best_edge[x])
+            for j in range(offsets[x], offsets[x + 1]):
+                y = targets[j]
+                if done[y]:
+                    continue
+                if position[y] == -1:
+                    best_edge[y] = edge_ids[j]
+                    queue.push(y, weights[j])
+                elif weights[j] < key[y]:
+                    best_edge[y] = edge_ids[j]
+                    queue.decrease_key(y, weights[j])
+
+    if len(tree) < max(n - 1, 0) and not forest:
+        raise AssertionError('the graph is not connected, hence we cannot find a minimum spanning TREE')
+    return np.array(tree, dtype=np.int64)
+
+
+def prim_arrays(n: int, a, b, w, method: str | None = None, forest: bool = False) -> np.ndarray:
+    """
+    n: number of nodes (labeled from 0 to n - 1)
+    a, b, w: parallel arrays, the i-th edge joins a[i] and b[i] with weight w[i]
+    method: 'dense' (O(n^2)), 'heap' (O(m log n)) or None to pick by the density of the graph (see dense_cutover)
+    forest: if True, a disconnected graph gets a minimum spanning forest instead of an AssertionError
+
+    return: the indices of the MST edges (in the original arrays), in the order Prim's algorithm takes them
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    w = np.asarray(w)
+    if method is None:
+        method = 'dense' if 2 * len(w) >= dense_cutover(n) * n else 'heap'
+    if method == 'dense':
+        return prim_dense(n, a, b, w, forest)
+    if method == 'heap':
+        return prim_heap(n, a, b, w, forest)
+    raise ValueError(f'unknown method: {method}')
+
+
+# --- Borůvka: every round, every component takes its cheapest outgoing edge ---
+
+def largest(dtype) -> int | float:
+    return np.inf if np.issubdtype(dtype, np.floating) else np.iinfo(dtype).max
+
+
+def lightest_per_component(c: int, components: np.ndarray, weights: np.ndarray, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    c: number of components
+    components, weights, positions: candidate edges, the i-th one leaves components[i]
+    return: (components, weights, positions) with the lightest candidate of every component present,
+        breaking ties by the least position, so all the edges are distinct and the picked ones never close a cycle
+
+    two passes of np.minimum.at (least weight, and then least position among those), with no sorting
+    """
+    best_weight = np.full(c, largest(weights.dtype), dtype=weights.dtype)
+    np.minimum.at(best_weight, components, weights)
+    tie = weights == best_weight[components]
+    best_position = np.full(c, largest(np.int64), dtype=np.int64)
+    np.minimum.at(best_position, components[tie], positions[tie])
+    present = np.flatnonzero(best_position != largest(np.int64))
+    return present, best_weight[present], best_position[present]
+
+
+worker_edges = None
+
+
+def init_boruvka_worker(labels, a, b, w):
+    global worker_edges
+    worker_edges = attach_arrays(labels, a, b, w)
+
+
+def cheapest_in(lo: int, hi: int, c: int, edges: list[np.ndarray] | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    edges: [labels, a, b, w], where labels[u] is the component of node u (from 0 to c - 1)
+    return: the cheapest edge leaving every component, among the edges lo .. hi - 1 (see lightest_per_component)
+    """
+    labels, a, b, w = edges if edges is not None else worker_edges
+    ca = labels[a[lo:hi]]
+    cb = labels[b[lo:hi]]
+    outgoing = np.flatnonzero(ca != cb)
+    components = np.concatenate((ca[outgoing], cb[outgoing]))
+    positions = np.concatenate((outgoing, outgoing)) + lo
+    return lightest_per_component(c, components, w[positions], positions)
+
+
+def boruvka_arrays(n: int, a, b, w, workers: int | None = 1, chunk_size: int | None = None, forest: bool = False) -> np.ndarray:
+    """
+    n: number of nodes (labeled from 0 to n - 1)
+    a, b, w: parallel arrays, the i-th edge joins a[i] and b[i] with weight w[i] (they are not modified)
+    workers: number of processes (os.cpu_count() if None); with 1, everything runs in this process
+    chunk_size: number of edges per task
+    forest: if True, a disconnected graph gets a minimum spanning forest instead of an AssertionError
+
+    return: the indices of the MST edges (in the original arrays), round by round
+
+    Borůvka's algorithm: in every round each component picks its cheapest outgoing edge (a vectorized pass over
+    chunks of edges, possibly in parallel), the picked edges are joined with the DisjointSets,
+    and the edges that end up inside a component are dropped; the number of components at least halves every round
+    """
+    index_dtype = CSRGraph.index_dtype(n)
+    # copies, since they're compacted in place every round (which keeps them in the order of the input,
+    # so breaking ties by position is the same as breaking them by original index)
+    a = np.array(a, dtype=index_dtype)
+    b = np.array(b, dtype=index_dtype)
+    w = np.array(w)
+    index = np.arange(len(w), dtype=np.int64)
+    labels = np.arange(n, dtype=index_dtype)
+    c = n
+    workers = workers or os.cpu_count()
+
+    blocks = []
+    executor = None
+    edges = None
+    try:
+        if workers > 1:
+            # the edges live in shared memory: between rounds this process compacts them in place and
+            # rewrites labels, and the workers always read the first k edges
+            shared = [shared_copy(array, blocks) for array in (labels, a, b, w)]
+            (labels, a, b, w), descriptions = zip(*shared)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=init_boruvka_worker, initargs=descriptions)
+        edges = [labels, a, b, w]
+
+        ds = DisjointSets(n)
+        everything = np.arange(n)
+        tree = []
+        k = len(w)
+        while k > 0:
+            size = chunk_size or max(1 << 16, -(-k // workers))
+            starts = list(range(0, k, size))
+            ends = [min(lo + size, k) for lo in starts]
+            if executor is None:
+                results = [cheapest_in(lo, hi, c, edges) for lo, hi in zip(starts, ends)]
+            else:
+                results = list(executor.map(cheapest_in, starts, ends, [c] * len(starts)))
+            # every chunk has its own cheapest edge per component: keep the cheapest of them
+            _, _, positions = lightest_per_component(c, *(np.concatenate(column) for column in zip(*results)))
+            positions = np.unique(positions) # two components can pick the same edge
+            if len(positions) == 0: # no edge leaves any component
+                break
+
+            merged = ds.union_many(a[positions], b[positions])
+            tree.extend(index[positions[merged]].tolist())
+            # contraction: the components are numbered 0 .. c - 1 and the edges inside a component are dropped
+            roots = ds.find_many(everything)
+            is_root = roots == everything
+            c = int(is_root.sum())
+            labels[:] = (np.cumsum(is_root) - 1)[roots]
+            keep = np.flatnonzero(labels[a[:k]] != labels[b[:k]])
+            for array in (a, b, w, index):
+                array[:len(keep)] = array[:k][keep]
+            k = len(keep)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        del labels, a, b, w, edges # the views must go before their blocks are closed
+        release(blocks)
+
+    if len(tree) < max(n - 1, 0) and not forest:
+        raise AssertionError('the graph is not connected, hence we cannot find a minimum spanning TREE')
+    return np.array(tree, dtype=np.int64)
+
+
+# --- verification: a spanning tree is minimum iff every other edge is at least as heavy as its tree path ---
+
+def smallest(dtype) -> int | float:
+    return -np.inf if np.issubdtype(dtype, np.floating) else np.iinfo(dtype).min
+
+
+def root_tree(n: int, a: np.ndarray, b: np.ndarray, w: np.ndarray, root: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    a, b, w: the n - 1 edges of a tree
+    return: (parent, parent_weight, depth) of every node when the tree hangs from root
+        (parent[root] = root and parent_weight[root] is the smallest value of the dtype)
+    """
+    graph = CSRGraph.from_edges(n, a, b, w, directed=False)
+    parent, parent_slot, depth, _ = bfs_tree(graph, root)
+    parent_weight = np.full(n, smallest(w.dtype), dtype=w.dtype)
+    has_parent = parent_slot >= 0
+    parent_weight[has_parent] = graph.weights[parent_slot[has_parent]]
+    return parent, parent_weight, depth
+
+
+def path_maxima(parent: np.ndarray, parent_weight: np.ndarray, depth: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    return: for every i, the heaviest edge on the tree path between u[i] and v[i]
+        (the smallest value of the dtype if u[i] == v[i])
+
+    binary lifting: up[k][x] is the ancestor 2^k levels above x and heaviest[k][x] the heaviest edge on the way;
+    all the queries climb together, one level of the tables at a time, in O((n + q) log n)
+    """
+    levels = max(1, int(depth.max()).bit_length())
+    up = [parent]
+    heaviest = [parent_weight]
+    for k in range(1, levels):
+        up.append(up[k - 1][up[k - 1]])
+        heaviest.append(np.maximum(heaviest[k - 1], heaviest[k - 1][up[k - 1]]))
+
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    deeper = depth[u] < depth[v]
+    u, v = np.where(deeper, v, u), np.where(deeper, u, v) # now u is the deeper one
+    best = np.full(len(u), smallest(parent_weight.dtype), dtype=parent_weight.dtype)
+    # 1. u climbs to the depth of v
+    difference = depth[u] - depth[v]
+    for k in range(levels):
+        climb = (difference >> k) & 1 == 1
+        best[climb] = np.maximum(best[climb], heaviest[k][u[climb]])
+        u[climb] = up[k][u[climb]]
+    # 2. both climb as long as they don't meet, from the longest jumps to the shortest
+    for k in reversed(range(levels)):
+        climb = up[k][u] != up[k][v]
+        best[climb] = np.maximum(best[climb], np.maximum(heaviest[k][u[climb]], heaviest[k][v[climb]]))
+        u[climb] = up[k][u[climb]]
+        v[climb] = up[k][v[climb]]
+    # 3. now they are siblings (or the same node), one edge below the LCA
+    last = u != v
+    best[last] = np.maximum(best[last], np.maximum(heaviest[0][u[last]], heaviest[0][v[last]]))
+    return best
+
+
+def validate_mst_arrays(n: int, a, b, w, tree) -> bool:
+    """
+    n: number of nodes (labeled from 0 to n - 1)
+    a, b, w: parallel arrays, the i-th edge joins a[i] and b[i] with weight w[i]
+    tree: the indices of the edges of the supposed MST
+
+    return: True if tree is a minimum spanning tree, in O((n + m) log n) without computing another MST:
+        1. the indices are valid and distinct
+        2. they're n - 1 edges that never close a cycle (checked with the DisjointSets), so they form a spanning tree
+        3. every edge out of the tree is at least as heavy as every edge on the tree path between its endpoints
+            (otherwise swapping them gives a lighter spanning tree), with the path maxima from path_maxima
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    w = np.asarray(w)
+    tree = np.asarray(tree)
+    m = len(w)
+    if n < 1 or len(tree) != n - 1:
+        return False
+    if len(tree) == 0: # a single node
+        return True
+    if not np.issubdtype(tree.dtype, np.integer) or tree.min() < 0 or tree.max() >= m:
+        return False
+    in_tree = np.zeros(m, dtype=bool)
+    in_tree[tree] = True
+    if in_tree.sum() != len(tree): # some index is repeated
+        return False
+
+    if not DisjointSets(n).union_many(a[tree], b[tree]).all(): # some edge closes a cycle
+        return False
+
+    parent, parent_weight, depth = root_tree(n, a[tree], b[tree], w[tree])
+    others = np.flatnonzero(~in_tree)
+    if len(others) == 0:
+        return True
+    return bool((w[others] >= path_maxima(parent, parent_weight, depth, a[others], b[others])).all())
@@ -0,0 +1,117 @@
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+class PathTree:
+    """
+    all the shortest paths from a source, stored once as a tree: pred[v] is the node before v on its path
+    (-1 for the source and for unreachable nodes) and depth[v] the number of edges of the path (-1 if unreachable)
+
+    a path is never stored on its own: path(v) walks it once into a list,
+    walk_up(v) yields it lazily from v back to the source, and iter_paths streams many paths
+    sharing their common prefixes
+    """
+
+    def __init__(self, pred: np.ndarray, depth: np.ndarray):
+        self.pred = np.asarray(pred, dtype=np.int64)
+        self.depth = np.asarray(depth, dtype=np.int64)
+        self.n = len(self.pred)
+        self._lists = None
+        self._children = None
+
+    def reachable(self, v: int) -> bool:
+        return self.depth[v] != -1
+
+    def lists(self) -> tuple[list[int], list[int]]:
+        """
+        (pred, depth) as Python lists, built once: the walks go one node at a time, faster over lists than over arrays
+        """
+        if self._lists is None:
+            self._lists = (self.pred.tolist(), self.depth.tolist())
+        return self._lists
+
+    def walk_up(self, v: int):
+        """
+        yields the nodes of the path from v back to the source (v first), one by one
+        """
+        pred, depth = self.lists()
+        if depth[v] == -1:
+            return
+        while v != -1:
+            yield v
+            v = pred[v]
+
+    def path(self, v: int) -> list[int] | None:
+        """
+        return: the nodes of the path from the source to v, or None if v is unreachable
+        """
+        pred, depth = self.lists()
+        if depth[v] == -1:
+            return None
+        path = []
+        while v != -1:
+            path.append(v)
+            v = pred[v]
+        path.reverse()
+        return path
+
+    def children(self) -> CSRGraph:
+        """
+        the tree with its edges pointing down (pred[v] --> v), built once
+        """
+        if self._children is None:
+            nodes = np.flatnonzero(self.pred != -1)
+            self._children = CSRGraph.from_edges(self.n, self.pred[nodes], nodes)
+        return self._children
+
+    def iter_paths(self, targets=None):
+        """
+        targets: the nodes whose paths are wanted (every reachable node if None); unreachable ones are skipped
+        yields (target, path) for each target, in depth-first order of the tree (not in the order of targets)
+
+        only the union of the paths is visited, once: every prefix is shared by all the paths that go through it
+        path is a view of a buffer that holds the current root-to-node path, so it is only valid until the
+        next iteration (copy it to keep it); the work is O(size of the union + number of targets)
+        """
+        children = self.children()
+        depth = self.depth
+        if targets is None:
+            wanted = depth != -1
+        else:
+            targets = np.asarray(targets, dtype=np.int64)
+            wanted = np.zeros(self.n, dtype=bool)
+            wanted[targets[depth[targets] != -1]] = True
+        # mark the union of the paths, climbing from all the targets at once until the marked part is reached
+        on_paths = wanted.copy()
+        frontier = np.flatnonzero(wanted)
+        while len(frontier) > 0:
+            up = self.pred[frontier]
+            up = np.unique(up[up != -1])
+            frontier = up[~on_paths[up]]
+            on_paths[frontier] = True
+        roots = np.flatnonzero(on_paths & (depth == 0))
+        if len(roots) == 0:
+            return
+
+        buffer = np.empty(int(depth[on_paths].max()) + 1, dtype=np.int64)
+        offsets, below = children.offsets.tolist(), children.targets.tolist()
+        wanted_list = wanted.tolist()
+        on_paths_list = on_paths.tolist()
+        stack = roots.tolist()
+        _, depth_list = self.lists()
+        while stack:
+            node = stack.pop()
+            d = depth_list[node]
+            buffer[d] = node
+            if wanted_list[node]:
+                yield node, buffer[: d + 1]
+            stack.extend(child for child in below[offsets[node] : offsets[node + 1]] if on_paths_list[child])
+
+    def paths(self, targets) -> list[np.ndarray | None]:
+        """
+        return: the path to every node of targets, in the same order (None for the unreachable ones),
+            all of them extracted together by iter_paths
+        """
+        found = {node: path.copy() for node, path in self.iter_paths(targets)}
+        return [found.get(int(target)) for target in np.asarray(targets).tolist()]
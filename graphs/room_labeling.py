@@ -0,0 +1,106 @@
+import re
+import sys
+
+import numpy as np
+
+from disjoint_sets import component_roots
+
+FREE_RUN = re.compile(rb'[^#]+')
+
+
+def find(parent: list[int], a: int) -> int:
+    while parent[a] != a:
+        parent[a] = parent[parent[a]] # path halving
+        a = parent[a]
+    return a
+
+
+def count_rooms_streaming(rows) -> int:
+    """
+    rows: the rows of the maze, one at a time (str or bytes, '#' is a wall), e.g. a file being read line by line
+    return: the number of rooms (connected components of free cells)
+
+    only the previous row is kept, as its runs of consecutive free cells with the label of their room.
+    the runs of the current row are joined (union-find over the labels of both rows only) with the runs above
+    that share a column; a room of the previous row that touches no run of the current row is finished and counted.
+    so memory is O(m), no matter how many rows there are
+    """
+    rooms = 0
+    previous = [] # (start, end, label) for every run of the previous row, from left to right
+    n_previous_labels = 0
+    for line in rows:
+        if isinstance(line, str):
+            line = line.encode()
+        line = line.rstrip(b'\r\n')
+        runs = [match.span() for match in FREE_RUN.finditer(line)]
+
+        # labels 0 .. n_previous_labels - 1 are the rooms of the previous row, the runs of this row come after
+        parent = list(range(n_previous_labels + len(runs)))
+        touched = bytearray(n_previous_labels) # touched[label]: the room goes on in this row
+        i = 0
+        for j, (start, end) in enumerate(runs):
+            # two-pointer merge: the runs above that overlap [start, end)
+            while i < len(previous) and previous[i][1] <= start:
+                i += 1
+            k = i
+            while k < len(previous) and previous[k][0] < end:
+                label = previous[k][2]
+                touched[label] = 1
+                a, b = find(parent, label), find(parent, n_previous_labels + j)
+                if a != b:
+                    parent[a] = b
+                k += 1
+
+        # the labels of the previous row are different rooms, only a run of this row can join them,
+        # so a label that no run touched is a room that is finished
+        rooms += n_previous_labels - sum(touched)
+
+        # the labels of this row, renumbered from 0
+        new_label = {}
+        previous = []
+        for j, (start, end) in enumerate(runs):
+            root = find(parent, n_previous_labels + j)
+            if root not in new_label:
+                new_label[root] = len(new_label)
+            previous.append((start, end, new_label[root]))
+        n_previous_labels = len(new_label)
+    return rooms + n_previous_labels # the rooms that reach the last row
+
+
+def label_rooms(maze: list[str] | list[bytes] | np.ndarray) -> tuple[np.ndarray, int]:
+    """
+    maze: the rows of the maze or a 2D array of bytes ('#' is a wall), that fits in memory
+    return: (labels, rooms), labels[row, col] is the room of the cell (0 .. rooms - 1) or -1 for walls
+
+    the free cells are joined to their free neighbors with the vectorized union-find of component_roots
+    """
+    if not isinstance(maze, np.ndarray):
+        rows = [row.encode() if isinstance(row, str) else bytes(row) for row in maze]
+        maze = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1)
+    free = maze != ord('#')
+    n, m = free.shape
+    cell = np.arange(n * m).reshape(n, m)
+
+    horizontal = free[:, :-1] & free[:, 1:]
+    vertical = free[:-1, :] & free[1:, :]
+    a = np.concatenate((cell[:, :-1][horizontal], cell[:-1, :][vertical]))
+    b = np.concatenate((cell[:, 1:][horizontal], cell[1:, :][vertical]))
+
+    parent = component_roots(n * m, a, b)
+
+    roots = parent.reshape(n, m)[free]
+    _, compact = np.unique(roots, return_inverse=True)
+    labels = np.full((n, m), -1, dtype=np.int64)
+    labels[free] = compact
+    return labels, int(compact.max()) + 1 if len(compact) > 0 else 0
+
+
+def read_rows(stream=None):
+    """
+    reads "n m" and then yields the n rows of the maze one by one, from a binary stream (sys.stdin.buffer by default)
+    """
+    if stream is None:
+        stream = sys.stdin.buffer
+    n, m = map(int, stream.readline().split())
+    for _ in range(n):
+        yield stream.readline()
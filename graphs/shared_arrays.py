@@ -0,0 +1,49 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# shared memory for process pools: the workers see the same buffers instead of receiving a pickled copy per task
+
+attached_blocks = [] # the blocks attached by this process (a worker), kept alive as long as it lives
+
+
+def share_array(array: np.ndarray, blocks: list) -> tuple[str, tuple, str]:
+    """
+    copies array into a new shared memory block (appended to blocks, so the caller can release it)
+    return: what a worker needs to attach to it: (name, shape, dtype)
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    blocks.append(block)
+    return block.name, array.shape, array.dtype.str
+
+
+def shared_copy(array: np.ndarray, blocks: list) -> tuple[np.ndarray, tuple[str, tuple, str]]:
+    """
+    share_array, and also a view of the shared copy, so this process can keep writing to it
+    """
+    description = share_array(array, blocks)
+    return np.ndarray(array.shape, dtype=array.dtype, buffer=blocks[-1].buf), description
+
+
+def attach_arrays(*descriptions: tuple[str, tuple, str]) -> list[np.ndarray]:
+    """
+    descriptions: what share_array returned in the parent process
+    return: the shared arrays, as views of the same memory
+    """
+    arrays = []
+    for name, shape, dtype in descriptions:
+        block = shared_memory.SharedMemory(name=name)
+        attached_blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    return arrays
+
+
+def release(blocks: list):
+    """
+    closes and removes the blocks created by share_array (every view of them must be gone by then)
+    """
+    for block in blocks:
+        block.close()
+        block.unlink()
+    blocks.clear()
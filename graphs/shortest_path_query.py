@@ -0,0 +1,169 @@
+import heapq
+
+from csr_graph import CSRGraph, edges_of
+from graph_loader import edges_from_ints, read_ints
+
+INF = float("inf")
+
+
+def reversed_graph(n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph) -> list[list[tuple[int,int]]] | CSRGraph:
+    """
+    returns the graph with every edge u -> v (weight w) replaced by v -> u (weight w)
+    """
+    if isinstance(adj_list, CSRGraph):
+        return adj_list.reverse()
+    reverse = [[] for _ in range(n)]
+    for u in range(n):
+        for v, w in adj_list[u]:
+            reverse[v].append((u, w))
+    return reverse
+
+
+def build_path(prev: dict[int, int], source: int, target: int) -> list[int]:
+    path = [target]
+    while path[-1] != source:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path
+
+
+def dijkstra_query(source: int, target: int, adj_list) -> tuple[float, list[int] | None, int]:
+    """
+    dijkstra from source that stops as soon as target is settled
+    return: (distance, path, number of settled vertices); distance is inf and path is None if target is unreachable
+
+    the distances are kept in dicts, so a query only touches the vertices it reaches
+    """
+    distance = {source: 0}
+    prev = {}
+    settled = set()
+    out = edges_of(adj_list)
+    priority_queue = [(0, source)]
+    while priority_queue:
+        d_u, u = heapq.heappop(priority_queue)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u == target:
+            return d_u, build_path(prev, source, target), len(settled)
+        for v, w in out(u):
+            if d_u + w < distance.get(v, INF):
+                distance[v] = d_u + w
+                prev[v] = u
+                heapq.heappush(priority_queue, (d_u + w, v))
+    return INF, None, len(settled)
+
+
+def bidirectional_query(source: int, target: int, adj_list, reverse_adj_list) -> tuple[float, list[int] | None, int]:
+    """
+    runs dijkstra forward from source (over adj_list) and backward from target (over reverse_adj_list),
+    always advancing the side whose queue has the smaller minimum
+
+    best is the shortest source -> target path seen so far (an edge relaxed between both searches);
+    once the two queue minimums add up to at least best, no shorter path can exist
+    """
+    if source == target:
+        return 0, [source], 1
+    graphs = (edges_of(adj_list), edges_of(reverse_adj_list))
+    distance = ({source: 0}, {target: 0})
+    prev = ({}, {}) # prev for the forward search, next (towards target) for the backward one
+    settled = (set(), set())
+    queues = ([(0, source)], [(0, target)])
+    best = INF
+    meeting = None
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        d_u, u = heapq.heappop(queues[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+        other_distance = distance[1 - side]
+        for v, w in graphs[side](u):
+            if d_u + w < distance[side].get(v, INF):
+                distance[side][v] = d_u + w
+                prev[side][v] = u
+                heapq.heappush(queues[side], (d_u + w, v))
+            if v in other_distance and d_u + w + other_distance[v] < best:
+                best = d_u + w + other_distance[v]
+                meeting = (u, v) if side == 0 else (v, u) # the edge meeting[0] -> meeting[1] joins both halves
+
+    n_settled = len(settled[0]) + len(settled[1])
+    if meeting is None:
+        return INF, None, n_settled
+    u, v = meeting
+    path = build_path(prev[0], source, u) # source -> ... -> u
+    node = v
+    while node != target: # v -> ... -> target following the backward search tree
+        path.append(node)
+        node = prev[1][node]
+    path.append(target)
+    return best, path, n_settled
+
+
+def astar_query(source: int, target: int, adj_list, heuristic) -> tuple[float, list[int] | None, int]:
+    """
+    heuristic(v): a lower bound of the distance from v to target (it must never overestimate it)
+
+    like dijkstra_query, but the queue is ordered by distance[v] + heuristic(v), so the search is pulled towards target.
+    a vertex may be expanded again if a shorter path to it shows up later (needed when the heuristic is
+    admissible but not consistent)
+    """
+    distance = {source: 0}
+    prev = {}
+    n_settled = 0
+    out = edges_of(adj_list)
+    priority_queue = [(heuristic(source), 0, source)]
+    while priority_queue:
+        _, d_u, u = heapq.heappop(priority_queue)
+        if d_u > distance[u]:
+            continue # a stale entry
+        n_settled += 1
+        if u == target:
+            return d_u, build_path(prev, source, target), n_settled
+        for v, w in out(u):
+            if d_u + w < distance.get(v, INF):
+                distance[v] = d_u + w
+                prev[v] = u
+                heapq.heappush(priority_queue, (d_u + w + heuristic(v), d_u + w, v))
+    return INF, None, n_settled
+
+
+def shortest_path(source: int, target: int, adj_list, mode: str = "dijkstra", heuristic=None, reverse_adj_list=None) -> tuple[float, list[int] | None, int]:
+    """
+    source, target: the endpoints of the query
+    adj_list[u] contains a list of tuples (v, w) meaning there is an edge from u to v with weight w >= 0
+    mode: "dijkstra" (stops when target is settled), "bidirectional" or "astar"
+    heuristic(v): required by "astar", a lower bound of the distance from v to target
+    reverse_adj_list: the reversed graph used by "bidirectional" (it is built if not given; pass it to reuse it across queries)
+
+    return: (distance, path, number of settled vertices); distance is inf and path is None if target is unreachable
+    """
+    if mode == "dijkstra":
+        return dijkstra_query(source, target, adj_list)
+    if mode == "bidirectional":
+        if reverse_adj_list is None:
+            reverse_adj_list = reversed_graph(len(adj_list), adj_list)
+        return bidirectional_query(source, target, adj_list, reverse_adj_list)
+    if mode == "astar":
+        assert heuristic is not None, 'A* needs a heuristic'
+        return astar_query(source, target, adj_list, heuristic)
+    raise ValueError(f'unknown mode {mode}')
+
+
+def main():
+    # "n m", then m lines "u v w" (a directed edge u -> v with weight = w) and a last line "source target"
+    values = read_ints()
+    n, a, b, w = edges_from_ints(values, weighted=True)
+    adj_list = CSRGraph.from_edges(n, a, b, w)
+    source, target = int(values[-2]), int(values[-1])
+
+    for mode in ["dijkstra", "bidirectional"]:
+        distance, path, n_settled = shortest_path(source, target, adj_list, mode)
+        print(f"{mode}: distance = {distance}, path = {path}, settled = {n_settled}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from random import Random
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra_heap import shortest_paths
+from graph_loader import read_graph
+
+
+class ShortestPathCache:
+    """
+    keeps the result of dijkstra_heap.shortest_paths for the most recently used sources
+
+    every entry is stored compactly as two arrays of length n:
+        distance: float64 (inf for unreachable vertices)
+        prev: int32 (-1 for the source and the unreachable vertices)
+    entries are evicted in least-recently-used order once they take more than max_bytes
+
+    the cache can't see the graph being modified: call update_graph() (or invalidate()) after any change
+    """
+
+    def __init__(self, n: int, adj_list: list[list[tuple[int,int]]] | CSRGraph, max_bytes: int = 64 * 2**20, indexed: bool = False):
+        self.n = n
+        self.adj_list = adj_list
+        self.max_bytes = max_bytes
+        self.indexed = indexed
+        self.entries = OrderedDict() # source -> (distance, prev), the least recently used first
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def entry_bytes(self) -> int:
+        return self.n * (np.dtype(np.float64).itemsize + np.dtype(np.int32).itemsize)
+
+    def query(self, source: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        return: (distance, prev) from source, computed only if it isn't cached
+        the arrays are shared with the cache, so they are read-only
+        """
+        if source in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(source)
+            return self.entries[source]
+        self.misses += 1
+
+        distance, prev = shortest_paths(self.n, source, self.adj_list, self.indexed)
+        distance = np.array(distance, dtype=np.float64)
+        prev = np.array([-1 if p is None else p for p in prev], dtype=np.int32)
+        distance.flags.writeable = False
+        prev.flags.writeable = False
+
+        if self.entry_bytes <= self.max_bytes:
+            while self.bytes_used + self.entry_bytes > self.max_bytes:
+                self.entries.popitem(last=False)
+                self.bytes_used -= self.entry_bytes
+                self.evictions += 1
+            self.entries[source] = (distance, prev)
+            self.bytes_used += self.entry_bytes
+        return distance, prev
+
+    def distance(self, source: int, target: int) -> float:
+        return float(self.query(source)[0][target])
+
+    def path(self, source: int, target: int) -> list[int] | None:
+        """
+        return: the vertices of a shortest path from source to target, or None if target is unreachable
+        """
+        distance, prev = self.query(source)
+        if distance[target] == np.inf:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(int(prev[path[-1]]))
+        path.reverse()
+        return path
+
+    def invalidate(self):
+        """
+        drops every cached entry (the counters are kept)
+        """
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def update_graph(self, adj_list: list[list[tuple[int,int]]] | CSRGraph, n: int | None = None):
+        self.adj_list = adj_list
+        if n is not None:
+            self.n = n
+        self.invalidate()
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes_used": self.bytes_used,
+        }
+
+
+def main():
+    # skewed sources: a few depots get most of the queries
+    adj_list = read_graph(weighted=True) # "n m" and then m lines "u v w"
+    n = adj_list.n
+    cache = ShortestPathCache(n, adj_list, max_bytes=4 * n * 12) # room for 4 sources (12 bytes per vertex)
+    rng = Random(0)
+    depots = rng.sample(range(n), min(n, 3))
+    for _ in range(1000):
+        source = rng.choice(depots) if rng.random() < 0.9 else rng.randrange(n)
+        cache.distance(source, rng.randrange(n))
+    print(cache.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+import numpy as np
+
+from csr_graph import CSRGraph
+from dfs_engine import DepthFirstSearch
+from graph_loader import edges_from_ints, read_ints
+
+
+def strongly_connected_components(adj_list) -> tuple[np.ndarray, int]:
+    """
+    adj_list[u] is the list of nodes v such that there is an edge u --> v
+    return: (component, n_components), where component[u] is the id of the strongly connected component of u
+        and the ids are a topological order of the components: every edge between two components goes
+        from a smaller id to a larger one
+
+    Tarjan's algorithm with an explicit stack (the Python call stack never grows with the depth of the graph):
+    index[u] is the order in which u was reached, low[u] the smallest index reachable from the subtree of u
+    through nodes still on the stack, and u is the root of a component when low[u] == index[u]
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    n = graph.n
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    next_slot = offsets[:-1] # the next out-edge to explore of every node
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    component = [-1] * n
+    stack = [] # the nodes whose component is not known yet
+    counter = 0
+    n_components = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        path = [root] # the current path of the search (what the recursion would keep in its calls)
+        while path:
+            node = path[-1]
+            slot, end = next_slot[node], offsets[node + 1]
+            while slot < end:
+                neighbor = targets[slot]
+                slot += 1
+                if index[neighbor] == -1:
+                    break
+                if on_stack[neighbor] and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            else:
+                # every out-edge of node has been explored
+                next_slot[node] = end
+                path.pop()
+                if path and low[node] < low[path[-1]]:
+                    low[path[-1]] = low[node]
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component[member] = n_components
+                        if member == node:
+                            break
+                    n_components += 1
+                continue
+            # go deeper, next_slot remembers where to continue with node
+            next_slot[node] = slot
+            index[neighbor] = low[neighbor] = counter
+            counter += 1
+            stack.append(neighbor)
+            on_stack[neighbor] = 1
+            path.append(neighbor)
+
+    # a component is finished after all the components it reaches, so Tarjan numbers them in reverse topological order
+    return n_components - 1 - np.array(component, dtype=np.int64), n_components
+
+
+def condensation(adj_list, component: np.ndarray, n_components: int) -> CSRGraph:
+    """
+    return: the DAG with one node per strongly connected component and an edge c --> d if some edge of the graph
+        goes from component c to component d (without repeated edges)
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    sources, targets, _ = graph.edge_arrays()
+    a = component[sources]
+    b = component[targets]
+    keys = np.unique(a[a != b] * n_components + b[a != b])
+    return CSRGraph.from_edges(n_components, keys // n_components, keys % n_components)
+
+
+def component_levels(dag: CSRGraph) -> np.ndarray:
+    """
+    dag: a DAG whose ids are a topological order (every edge goes from a smaller id to a larger one),
+        like the condensation
+    return: level, where level[c] is the number of edges of the longest path that ends at c
+        (0 for the nodes without incoming edges), so every edge goes to a larger level
+
+    one pass in id order over Python lists: on a long chain a NumPy step per level costs far more than the edges
+    """
+    offsets, targets = dag.offsets.tolist(), dag.targets.tolist()
+    level = [0] * dag.n
+    for c in range(dag.n):
+        below = level[c] + 1
+        for d in targets[offsets[c] : offsets[c + 1]]:
+            if level[d] < below:
+                level[d] = below
+    return np.array(level, dtype=np.int64)
+
+
+def transitive_closure(dag: CSRGraph, level: np.ndarray, chunk_bytes: int = 2**26) -> np.ndarray:
+    """
+    dag: a DAG, level: its component_levels
+    return: closure, an n x ceil(n / 8) array of bits (packed as in np.packbits, with bitorder='little'):
+        bit v of row u is set if u reaches v (every node reaches itself)
+
+    the rows of a level are the OR of the rows of their successors, which are in later levels,
+    so the levels are processed from the last one, a block of edges at a time
+    (only used while the closure fits in memory, so there are at most a few tens of thousands of levels)
+    """
+    n = dag.n
+    closure = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+    nodes = np.arange(n)
+    closure[nodes, nodes >> 3] = (1 << (nodes & 7)).astype(np.uint8)
+    block = max(1, chunk_bytes // max(1, closure.shape[1]))
+    by_level = np.argsort(level, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(level))))
+    for k in range(len(bounds) - 2, -1, -1):
+        sources, slots = dag.out_edges(by_level[bounds[k] : bounds[k + 1]])
+        targets = dag.targets[slots]
+        for start in range(0, len(slots), block):
+            np.bitwise_or.at(closure, sources[start : start + block], closure[targets[start : start + block]])
+    return closure
+
+
+def min_reachable_rank(dag: CSRGraph, ranks: np.ndarray) -> np.ndarray:
+    """
+    dag: a DAG whose ids are a topological order
+    ranks: a k x n array, every row a numbering of the nodes that decreases along every edge
+    return: low (k x n), where low[i][u] is the smallest ranks[i] of a node reachable from u (u included)
+
+    one pass in decreasing id order over Python lists, so the successors of a node are done before it
+    """
+    offsets, targets = dag.offsets.tolist(), dag.targets.tolist()
+    lows = ranks.tolist()
+    for c in range(dag.n - 1, -1, -1):
+        successors = targets[offsets[c] : offsets[c + 1]]
+        if successors:
+            for low in lows:
+                best = min(map(low.__getitem__, successors))
+                if best < low[c]:
+                    low[c] = best
+    return np.array(lows, dtype=np.int64).reshape(ranks.shape)
+
+
+class ReachabilityIndex:
+    """
+    answers "does u reach v" on a directed graph without a new search per query
+
+    the graph is condensed into the DAG of its strongly connected components (component ids are a topological order),
+    and then, over that DAG:
+        if the closure fits in max_closure_bytes, a bitset transitive closure: every query is one bit, O(1)
+        otherwise interval labels (GRAIL): for n_labelings numberings rank[i] that decrease along every edge,
+            u reaches v only if [low[i][v], rank[i][v]] is inside [low[i][u], rank[i][u]] (low: the smallest rank
+            reachable), and the first numbering is the postorder of a depth-first search, so v is a descendant of u
+            in that search tree (and u reaches it) if tree_low[u] <= rank[0][v] <= rank[0][u]
+            most queries are decided by those O(n_labelings) comparisons (and by the topological levels: u only
+            reaches deeper levels); the rest run a search from u that only enters the components whose labels
+            still contain those of v
+    """
+
+    def __init__(self, adj_list, n_labelings: int = 3, max_closure_bytes: int = 2**26, seed: int = 0):
+        graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+        self.component, self.n_components = strongly_connected_components(graph)
+        self.dag = condensation(graph, self.component, self.n_components)
+        c = self.n_components
+        self.level = component_levels(self.dag)
+        self.closure = None
+        if c * ((c + 7) // 8) <= max_closure_bytes:
+            self.closure = transitive_closure(self.dag, self.level)
+            return
+
+        rng = np.random.default_rng(seed)
+        # the first numbering: the postorder of a depth-first search that visits the successors in random order
+        sources, targets, _ = self.dag.edge_arrays()
+        shuffle = rng.permutation(len(sources))
+        search = DepthFirstSearch(CSRGraph.from_edges(c, sources[shuffle], targets[shuffle]))
+        self.tree_low = np.zeros(c, dtype=np.int64) # the first rank of the subtree of u: the ranks finished before u is reached
+
+        def reached(node, parent):
+            self.tree_low[node] = search.n_postorder
+
+        for root in rng.permutation(np.flatnonzero(self.level == 0)).tolist():
+            search.search(root, pre=reached)
+        ranks = [np.empty(c, dtype=np.int64)]
+        ranks[0][search.postorder_nodes()] = np.arange(c)
+        # the others: the levels in reverse order, each one shuffled
+        for _ in range(1, n_labelings):
+            rank = np.empty(c, dtype=np.int64)
+            rank[np.lexsort((rng.random(c), -self.level))] = np.arange(c)
+            ranks.append(rank)
+        self.rank = np.array(ranks)
+        self.low = min_reachable_rank(self.dag, self.rank)
+        # the pruned searches walk the DAG one node at a time, faster over lists than over NumPy arrays
+        self._lists = (self.dag.offsets.tolist(), self.dag.targets.tolist(), self.level.tolist(), self.tree_low.tolist(),
+                       self.rank.tolist(), self.low.tolist())
+
+    def _labels_contain(self, cu, cv) -> np.ndarray:
+        """
+        return: False where the labels prove that component cu does not reach component cv
+            (ids and levels are topological, so cu can only reach components with larger ones)
+        """
+        return ((cu < cv) & (self.level[cu] < self.level[cv])
+                & np.all((self.low[:, cu] <= self.low[:, cv]) & (self.rank[:, cv] <= self.rank[:, cu]), axis=0))
+
+    def _search(self, cu: int, cv: int) -> bool:
+        """
+        search over the condensation from cu to cv, that only enters the components whose labels contain those of cv
+        and stops as soon as it enters one that has cv in its subtree of the depth-first search tree
+        """
+        offsets, targets, level, tree_low, ranks, lows = self._lists
+        target_level = level[cv]
+        bounds = [(rank[cv], low[cv], rank, low) for rank, low in zip(ranks, lows)]
+        post = ranks[0][cv]
+        seen = {cu}
+        stack = [cu]
+        candidates = []
+        while stack:
+            node = stack.pop()
+            for neighbor in targets[offsets[node] : offsets[node + 1]]:
+                if neighbor == cv:
+                    return True
+                if neighbor in seen or level[neighbor] >= target_level:
+                    continue
+                if tree_low[neighbor] <= post <= ranks[0][neighbor]:
+                    return True
+                if all(low[neighbor] <= low_v and rank_v <= rank[neighbor] for rank_v, low_v, rank, low in bounds):
+                    seen.add(neighbor)
+                    candidates.append(neighbor)
+            # the deepest candidate (the closest to the level of cv) is explored first
+            candidates.sort(key=level.__getitem__)
+            stack.extend(candidates)
+            candidates.clear()
+        return False
+
+    def reaches(self, u, v) -> np.ndarray:
+        """
+        u, v: nodes (scalars or arrays, broadcast against each other)
+        return: a boolean array, True where there is a path from u to v
+        """
+        u, v = np.broadcast_arrays(np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64))
+        shape = u.shape
+        cu, cv = self.component[u.ravel()], self.component[v.ravel()]
+        if self.closure is not None:
+            return ((self.closure[cu, cv >> 3] >> (cv & 7)) & 1 == 1).reshape(shape)
+        answer = cu == cv
+        open_ = self._labels_contain(cu, cv)
+        in_tree = open_ & (self.tree_low[cu] <= self.rank[0, cv]) & (self.rank[0, cv] <= self.rank[0, cu])
+        answer = answer | in_tree
+        undecided = open_ & ~in_tree
+        for i in np.flatnonzero(undecided).tolist():
+            answer[i] = self._search(int(cu[i]), int(cv[i]))
+        return answer.reshape(shape)
+
+    def can_reach(self, u: int, v: int) -> bool:
+        return bool(self.reaches(u, v))
+
+
+def main():
+    # input: "n m" and then the edges "a b" meaning a --> b, then "q" and q lines "u v"
+    # output: the number of strongly connected components, and then "yes" or "no" for every query (does u reach v)
+    values = read_ints()
+    m = int(values[1])
+    n, a, b, _ = edges_from_ints(values[: 2 + 2 * m], weighted=False)
+    index = ReachabilityIndex(CSRGraph.from_edges(n, a, b))
+    queries = values[2 + 2 * m + 1 :].reshape(-1, 2)
+    print(index.n_components, "strongly connected components")
+    print("\n".join("yes" if x else "no" for x in index.reaches(queries[:, 0], queries[:, 1]).tolist()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,185 @@
-adj_list = []
-visited = []
-topological_order = []
+import numpy as np
+
+from csr_graph import CSRGraph, edges_of
+from graph_loader import read_graph
+
+
+class CycleError(Exception):
+    """
+    raised when the graph has a cycle, so there is no topological order
+    cycle: the nodes of one such cycle, in the order of its edges (cycle[-1] --> cycle[0] closes it)
+    """
+
+    def __init__(self, cycle: list[int]):
+        super().__init__(f'the graph has a cycle: {cycle}')
+        self.cycle = cycle
+
+
+def find_cycle(graph: CSRGraph, remaining: np.ndarray) -> list[int]:
+    """
+    remaining: the nodes that Kahn's algorithm could not remove
+    return: a cycle among them
+
+    every remaining node has an in-edge from another remaining node (otherwise it would have been removed),
+    so walking backwards through those in-edges must come back to a node already seen
+    """
+    is_remaining = np.zeros(graph.n, dtype=bool)
+    is_remaining[remaining] = True
+    reverse = graph.reverse()
+    seen_at = {}
+    walk = []
+    node = int(remaining[0])
+    while node not in seen_at:
+        seen_at[node] = len(walk)
+        walk.append(node)
+        predecessors = reverse.targets[reverse.offsets[node] : reverse.offsets[node + 1]]
+        node = int(predecessors[is_remaining[predecessors]][0])
+    cycle = walk[seen_at[node]:]
+    cycle.reverse() # the walk goes backwards, so reverse it to follow the edges
+    return cycle
+
+
+def topological_levels(adj_list) -> list[np.ndarray]:
+    """
+    adj_list[u] is the list of nodes v such that there is an edge u --> v
+    return: the nodes grouped in levels: level 0 has the nodes without incoming edges, and the nodes of level k
+        only depend on (have edges from) nodes of levels < k, so every level can be processed in parallel
+
+    Kahn's algorithm, one whole level at a time: the in-degrees of the targets of the level are decreased
+    with NumPy, and the ones that drop to 0 form the next level
+    raises CycleError (with a witness cycle) if the graph is not a DAG
+    """
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    indegree = np.bincount(graph.targets, minlength=graph.n)
+    level = np.flatnonzero(indegree == 0)
+    levels = []
+    done = 0
+    while len(level) > 0:
+        levels.append(level)
+        done += len(level)
+        _, slots = graph.out_edges(level)
+        targets = graph.targets[slots]
+        # only the touched nodes are updated, so a level costs O(its edges) even when there are many levels
+        touched, counts = np.unique(targets, return_counts=True)
+        indegree[touched] -= counts
+        level = touched[indegree[touched] == 0]
+    if done < graph.n:
+        raise CycleError(find_cycle(graph, np.flatnonzero(indegree > 0)))
+    return levels
+
+
+def topological_order(adj_list) -> list[int]:
+    """
+    adj_list[u] is the list of nodes v such that there is an edge u --> v
+    return: the nodes ordered so that every edge goes from left to right (the levels, one after the other)
+    raises CycleError (with a witness cycle) if the graph is not a DAG
+    """
+    levels = topological_levels(adj_list)
+    return np.concatenate(levels).tolist() if levels else []
+
+
+class IncrementalTopologicalOrder:
+    """
+    a topological order that is kept up to date while edges are inserted (Pearce-Kelly)
+
+    position[u]: the place of u in the order, node_at[i]: the node at place i
+    out_edges[u] / in_edges[u]: the lists of successors / predecessors of u
+
+    adding u --> v when u is already before v costs nothing; otherwise only the nodes whose position is
+    between those of v and u can be affected: the ones reachable from v and the ones that reach u in that window
+    get their positions shuffled (those that reach u first), and the rest of the order is untouched
+    """
+
+    def __init__(self, n: int, adj_list=None):
+        """
+        n nodes without edges, or the graph adj_list (it must be a DAG, it's sorted once with topological_order)
+        """
+        self.n = n
+        self.out_edges = [[] for _ in range(n)]
+        self.in_edges = [[] for _ in range(n)]
+        order = list(range(n))
+        if adj_list is not None:
+            order = topological_order(adj_list)
+            out = edges_of(adj_list)
+            for u in range(n):
+                for v in out(u):
+                    self.out_edges[u].append(v)
+                    self.in_edges[v].append(u)
+        self.node_at = order
+        self.position = [0] * n
+        for i, u in enumerate(order):
+            self.position[u] = i
+
+    def order(self) -> list[int]:
+        return list(self.node_at)
+
+    def _reach(self, source: int, edges: list[list[int]], inside, stop: int = -1) -> tuple[list[int], dict[int, int] | None]:
+        """
+        iterative search from source through edges, only into nodes for which inside(position) is True
+        return: (the nodes reached, parent of each one) and stops early if it reaches stop
+        """
+        position = self.position
+        parent = {source: -1}
+        stack = [source]
+        reached = []
+        while stack:
+            node = stack.pop()
+            reached.append(node)
+            for neighbor in edges[node]:
+                if neighbor == stop:
+                    parent[neighbor] = node
+                    return reached, parent
+                if neighbor not in parent and inside(position[neighbor]):
+                    parent[neighbor] = node
+                    stack.append(neighbor)
+        return reached, None
+
+    def add_edge(self, u: int, v: int):
+        """
+        inserts the edge u --> v and fixes the order
+        raises CycleError (and the edge isn't inserted) if v already reaches u
+        """
+        position = self.position
+        lower, upper = position[v], position[u]
+        if lower > upper: # u is already before v
+            self.out_edges[u].append(v)
+            self.in_edges[v].append(u)
+            return
+        if u == v:
+            raise CycleError([u])
+
+        # the nodes reachable from v that are not after u (if u is among them, there is a cycle)
+        forward, parent = self._reach(v, self.out_edges, lambda p: p < upper, stop=u)
+        if parent is not None:
+            cycle = [u]
+            while cycle[-1] != v:
+                cycle.append(parent[cycle[-1]])
+            cycle.reverse() # v ... u, and then the new edge u --> v closes it
+            raise CycleError(cycle)
+        # the nodes that reach u and are not before v
+        backward, _ = self._reach(u, self.in_edges, lambda p: p > lower)
+
+        # the places of both groups are reused: first everything that reaches u, then everything reachable from v
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        places = sorted(position[w] for w in backward + forward)
+        for place, w in zip(places, backward + forward):
+            position[w] = place
+            self.node_at[place] = w
+        self.out_edges[u].append(v)
+        self.in_edges[v].append(u)
 
-def dfs(node: int):
-    visited[node] = True 
-    for neighbor in adj_list[node]:
-        if not visited[neighbor]:
-            dfs(neighbor)
-    topological_order.append(node)
 
 def main():
-    global adj_list, visited
-    
-    n_nodes, n_edges = map(int, input().split())
-    adj_list = [[] for _ in range(n_nodes)]
-    visited = [False for _ in range(n_nodes)]
-    for _ in range(n_edges):
-        a, b = map(int, input().split()) # a --> b 
-        adj_list[a].append(b) # only this one 'cause the graph is directed
-    
-    for node in range(n_nodes):
-        if not visited[node]:
-            dfs(node)
-            
-    print(topological_order)
-    
+    adj_list = read_graph(directed=True) # "n_nodes n_edges" and then the edges "a b" meaning a --> b
+    try:
+        levels = topological_levels(adj_list)
+    except CycleError as error:
+        print("no topological order, there is a cycle:", error.cycle)
+        return
+    print(np.concatenate(levels).tolist() if levels else [])
+    for k, level in enumerate(levels):
+        print(f"level {k}:", level.tolist())
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
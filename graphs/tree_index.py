@@ -0,0 +1,171 @@
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_loader import edges_from_ints, read_ints
+
+
+def bfs_tree(graph: CSRGraph, root: int | np.ndarray = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    breadth-first search from root (or from all the nodes of an array of roots at once)
+    that expands the whole frontier at once with NumPy
+    return: (parent, parent_slot, depth, order)
+        parent[v]: the node from which v was reached (parent[root] = root, -1 if v was not reached)
+        parent_slot[v]: the position in graph.targets (and graph.weights) of the edge parent[v] -> v (-1 for root)
+        depth[v]: the number of edges between root and v
+        order: the reached nodes, level by level
+    """
+    n = graph.n
+    parent = np.full(n, -1, dtype=np.int64)
+    parent_slot = np.full(n, -1, dtype=np.int64)
+    depth = np.zeros(n, dtype=np.int64)
+    frontier = np.atleast_1d(np.asarray(root, dtype=np.int64))
+    parent[frontier] = frontier
+    levels = [frontier]
+    while len(frontier) > 0:
+        sources, slots = graph.out_edges(frontier)
+        targets = graph.targets[slots].astype(np.int64)
+        new = parent[targets] == -1
+        # a node can be reached from several nodes of the frontier (not in a tree): keep the first edge
+        targets, first = np.unique(targets[new], return_index=True)
+        slots, sources = slots[new][first], sources[new][first]
+        parent[targets] = sources
+        parent_slot[targets] = slots
+        depth[targets] = depth[sources] + 1
+        frontier = targets
+        levels.append(frontier)
+    return parent, parent_slot, depth, np.concatenate(levels)
+
+
+class TreeIndex:
+    """
+    a rooted tree, preprocessed once in O(n log n) to answer batches of queries with NumPy:
+        lca(u, v), distance(u, v), kth_ancestor(u, k), kth_on_path(u, v, k) in O(log n) per query,
+        and the diameter with its endpoints
+
+    adj_list[u] is the list of neighbors of u (or of tuples (v, w) for a weighted tree)
+
+    depth[v]: the number of edges between the root and v
+    distance_from_root[v]: the length of that path (the same as depth if the tree is not weighted)
+    up[k][v]: the ancestor 2^k levels above v (binary lifting; the root is its own ancestor)
+
+    every query takes scalars or NumPy arrays (broadcast against each other)
+    """
+
+    def __init__(self, adj_list, root: int = 0):
+        graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+        self.n = graph.n
+        self.root = root
+        parent, parent_slot, self.depth, self.order = bfs_tree(graph, root)
+        if len(self.order) < self.n:
+            raise ValueError('the graph is not connected, so it is not a tree')
+        index_dtype = CSRGraph.index_dtype(self.n)
+        self.up = [parent.astype(index_dtype)]
+        for k in range(1, max(1, int(self.depth.max()).bit_length())):
+            self.up.append(self.up[k - 1][self.up[k - 1]])
+
+        if graph.weights is None:
+            self.distance_from_root = self.depth
+        else:
+            # doubling: total[v] is the length of the 2^k edges above v (the root adds 0 edges of weight 0),
+            # and 2^(len(up)) is more than the depth of any node
+            total = np.zeros(self.n, dtype=graph.weights.dtype)
+            has_parent = parent_slot >= 0
+            total[has_parent] = graph.weights[parent_slot[has_parent]]
+            for up in self.up:
+                total = total + total[up]
+            self.distance_from_root = total
+
+    def kth_ancestor(self, u, k) -> np.ndarray:
+        """
+        return: the ancestor k levels above u, or -1 if u has less than k ancestors
+        """
+        u, k = np.broadcast_arrays(np.asarray(u, dtype=np.int64), np.asarray(k, dtype=np.int64))
+        valid = (k >= 0) & (k <= self.depth[u])
+        u = u.copy()
+        for bit, up in enumerate(self.up):
+            climb = valid & ((k >> bit) & 1 == 1)
+            u[climb] = up[u[climb]]
+        return np.where(valid, u, -1)
+
+    def lca(self, u, v) -> np.ndarray:
+        """
+        return: the lowest common ancestor of u and v
+        """
+        u, v = np.broadcast_arrays(np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64))
+        deeper = self.depth[u] < self.depth[v]
+        u, v = np.where(deeper, v, u), np.where(deeper, u, v) # now u is the deeper one (and both are copies)
+        # u climbs to the depth of v
+        difference = self.depth[u] - self.depth[v]
+        for bit, up in enumerate(self.up):
+            climb = (difference >> bit) & 1 == 1
+            u[climb] = up[u[climb]]
+        # both climb as long as they don't meet, from the longest jumps to the shortest
+        for up in reversed(self.up):
+            climb = up[u] != up[v]
+            u[climb] = up[u[climb]]
+            v[climb] = up[v[climb]]
+        return np.where(u == v, u, self.up[0][u])
+
+    def distance(self, u, v) -> np.ndarray:
+        """
+        return: the length of the path between u and v (the number of edges if the tree is not weighted)
+        """
+        ancestor = self.lca(u, v)
+        d = self.distance_from_root
+        return d[u] + d[v] - 2 * d[ancestor]
+
+    def kth_on_path(self, u, v, k) -> np.ndarray:
+        """
+        return: the node k edges away from u on the path from u to v (u for k = 0, v for k = edges between them),
+            or -1 if the path is shorter than k edges
+        """
+        u, v, k = np.broadcast_arrays(np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64), np.asarray(k, dtype=np.int64))
+        ancestor = self.lca(u, v)
+        up_part = self.depth[u] - self.depth[ancestor] # edges from u up to the LCA
+        length = up_part + self.depth[v] - self.depth[ancestor]
+        on_u_side = k <= up_part
+        # on the side of v, the node k edges from u is length - k edges above v
+        node = np.where(on_u_side, self.kth_ancestor(u, np.where(on_u_side, k, 0)), self.kth_ancestor(v, np.where(on_u_side, 0, length - k)))
+        return np.where((k >= 0) & (k <= length), node, -1)
+
+    def path(self, u: int, v: int) -> list[int]:
+        """
+        return: the nodes of the path from u to v
+        """
+        ancestor = int(self.lca(u, v))
+        parent = self.up[0]
+        left, right = [], []
+        while u != ancestor:
+            left.append(u)
+            u = int(parent[u])
+        while v != ancestor:
+            right.append(v)
+            v = int(parent[v])
+        return left + [ancestor] + right[::-1]
+
+    def diameter(self) -> tuple[int | float, int, int]:
+        """
+        return: (length, a, b), where the path between a and b is a longest path of the tree
+
+        the node furthest from any node (here the root) is an endpoint of a diameter,
+        and the node furthest from that endpoint is the other one
+        """
+        a = int(np.argmax(self.distance_from_root))
+        from_a = self.distance(a, np.arange(self.n))
+        b = int(np.argmax(from_a))
+        return from_a[b].item(), a, b
+
+
+def main():
+    # input: "n" and then the n - 1 edges "a b" of a tree, then "q" and q lines "u v"
+    # output: the distance between u and v for every query
+    values = read_ints()
+    n = int(values[0])
+    _, a, b, _ = edges_from_ints(values[: 1 + 2 * (n - 1)], weighted=False, with_m=False)
+    index = TreeIndex(CSRGraph.from_edges(n, a, b, directed=False))
+    queries = values[1 + 2 * (n - 1) + 1 :].reshape(-1, 2)
+    print("\n".join(map(str, index.distance(queries[:, 0], queries[:, 1]).tolist())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+# the modules of mst_hw use the shared implementations in graphs/ (mst.py, disjoint_sets.py, graph_loader.py, ...):
+# importing this module before them puts that folder on sys.path, once for all of them
+import os
+import sys
+
+GRAPHS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'graphs')
+if GRAPHS_DIR not in sys.path:
+    sys.path.append(GRAPHS_DIR)
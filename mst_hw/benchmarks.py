@@ -1,24 +1,183 @@
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from time import perf_counter
+
+from tqdm import tqdm
+
+import _graphs_path # puts graphs/ on sys.path, for the imports below
+from disjoint_sets import DisjointSets
+from indexed_heap import IndexedHeap
+
 from generator import generator
 from prim import prim_n2, prim_mlogn
 from kruskal import kruskal
-from matplotlib.pyplot import plt 
-from tqdm import tqdm 
+
+ALGORITHMS = {
+    'kruskal': kruskal,
+    'prim_n2': prim_n2,
+    'prim_mlogn': prim_mlogn,
+}
+
+# the methods whose calls are counted as operations: joins and finds of the Disjoint Sets, and the heap operations
+COUNTED = [
+    (DisjointSets, 'join'), (DisjointSets, 'find'),
+    (IndexedHeap, 'push'), (IndexedHeap, 'pop'), (IndexedHeap, 'decrease_key'),
+]
+
+
+def connected_graph(n: int, p: float, seed: int) -> tuple[int, list[tuple[int,int,int]]]:
+    """
+    the graph of the first seed from seed on that gives a connected graph (so the same arguments give the same graph)
+    return: (the seed that was used, edges_list)
+    """
+    while True:
+        edges_list = generator(n, p, seed=seed)
+        if len(kruskal(n, edges_list, forest=True)) == n - 1:
+            return seed, edges_list
+        seed += 1
+
+
+def count_operations(run) -> dict[str, int]:
+    """
+    runs run() once with every method of COUNTED wrapped in a counter
+    (in a separate run, since the wrappers slow everything down)
+    """
+    counts = {}
+    originals = []
+
+    def counting(name, method):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return method(*args, **kwargs)
+        return wrapper
+
+    for cls, name in COUNTED:
+        counts[name] = 0
+        method = getattr(cls, name)
+        originals.append((cls, name, method))
+        setattr(cls, name, counting(name, method))
+    try:
+        run()
+    finally:
+        for cls, name, method in originals:
+            setattr(cls, name, method)
+    return counts
+
+
+def measure(algorithm, n: int, edges_list: list[tuple[int,int,int]], repeats: int) -> dict:
+    """
+    wall time (the best of repeats runs), peak memory (traced in another run) and operation counts of one algorithm
+    """
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        algorithm(n, edges_list)
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    algorithm(n, edges_list)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': min(times),
+        'peak_bytes': peak,
+        'operations': count_operations(lambda: algorithm(n, edges_list)),
+    }
+
+
+def run_benchmarks(sizes: list[int], densities: list[float], seed: int, repeats: int, algorithms: list[str]) -> list[dict]:
+    results = []
+    cases = [(n, p) for n in sizes for p in densities]
+    for n, p in tqdm(cases):
+        used_seed, edges_list = connected_graph(n, p, seed)
+        for name in algorithms:
+            result = {'algorithm': name, 'n': n, 'p': p, 'm': len(edges_list), 'seed': used_seed}
+            result.update(measure(ALGORITHMS[name], n, edges_list, repeats))
+            results.append(result)
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """
+    return: a message for every result whose time or peak memory is more than (1 + threshold) times its baseline
+        (results and baseline are matched by algorithm, n and p)
+    """
+    reference = {(row['algorithm'], row['n'], row['p']): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = reference.get((row['algorithm'], row['n'], row['p']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if row[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{row['algorithm']} n = {row['n']} p = {row['p']}: "
+                                   f"{metric} {old[metric]:.6g} -> {row[metric]:.6g}")
+    return regressions
+
+
+def plot(results: list[dict], path: str):
+    """
+    running time (ms) vs n, one curve per algorithm and density (needs matplotlib, which is optional)
+    """
+    import matplotlib.pyplot as plt
+
+    figure, axes = plt.subplots()
+    for name in sorted({row['algorithm'] for row in results}):
+        for p in sorted({row['p'] for row in results}):
+            rows = sorted((row for row in results if row['algorithm'] == name and row['p'] == p), key=lambda row: row['n'])
+            axes.plot([row['n'] for row in rows], [row['seconds'] * 1000 for row in rows], marker='o', label=f'{name}, p = {p}')
+    axes.set_xlabel('n')
+    axes.set_ylabel('running time (ms)')
+    axes.set_xscale('log')
+    axes.set_yscale('log')
+    axes.legend(fontsize='small')
+    figure.savefig(path)
+
 
 def main():
-    # This function should measure the efficiency of implemented algorithms
-    # go through different values of n (eg: 10, 100, 1000, 10000) and for each n:
-    # repeat >= 10 times:
-    # 1. generate  random graph of size n
-    # 2. run kruskal and prim on all those graphs
-    # 3. measure the running time and average each (prim's and kruskal's)
-    # 4. plot the results of running time vs n. There should be three curves:
-    #       one for Kruskal, one for Prim's in O(n^2), and one for Prim's in O(m \log n)
-    
-    # additional:
-    # vary the density and perform similar tests
-    
-    # USE tqdm to have a progress bar for the different graphs
-    pass 
+    # usage: python benchmarks.py [--sizes 100 1000 ...] [--densities 0.1 0.5 ...] [--output results.json]
+    #                             [--baseline old.json [--threshold 0.2]] [--plot results.png]
+    # exits with status 1 if some algorithm got slower (or uses more memory) than the baseline by more than threshold
+    parser = argparse.ArgumentParser(description='benchmarks of the MST algorithms on seeded random graphs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000, 2000])
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.05, 0.2, 0.5, 1.0])
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', default='mst_benchmarks.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--plot')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.densities, args.seed, args.repeats, args.algorithms)
+    with open(args.output, 'w') as file:
+        json.dump({
+            'config': {'seed': args.seed, 'repeats': args.repeats, 'python': platform.python_version(), 'machine': platform.machine()},
+            'results': results,
+        }, file, indent=2)
+    for row in results:
+        print(f"{row['algorithm']:>10} n = {row['n']:6} p = {row['p']:5}: {row['seconds'] * 1000:9.1f} ms, "
+              f"peak {row['peak_bytes'] / 2**20:8.1f} MiB, {row['operations']}")
+
+    if args.plot:
+        try:
+            plot(results, args.plot)
+        except ImportError:
+            print('matplotlib is not installed, so there is no plot')
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)['results'], args.threshold)
+        for message in regressions:
+            print('REGRESSION:', message)
+        if regressions:
+            sys.exit(1)
+
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
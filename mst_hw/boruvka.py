@@ -0,0 +1,23 @@
+import os
+import sys
+
+import _graphs_path # puts graphs/ on sys.path, for the imports below
+from mst import boruvka_arrays, edge_arrays # the shared implementation, see graphs/mst.py
+
+
+def boruvka(n: int, edges_list: list[tuple[int,int,int]], workers: int | None = 1) -> list[int]:
+    """
+    n: number of nodes (the nodes are labeled from 0 to n - 1)
+    edges_list: list of edges in the graph.
+        Each edge is a tuple (a,b,w)
+            where a and b are the labels of the vertices
+            and w is the weight of that edge
+    workers: number of processes that look for the cheapest edges (os.cpu_count() if None)
+
+    return: a list of indices
+        each index corresponds to the index of an edge in the original list
+
+    algorithm: Borůvka's algorithm, every round each component takes its cheapest outgoing edge
+    """
+    a, b, w = edge_arrays(edges_list)
+    return boruvka_arrays(n, a, b, w, workers).tolist()
@@ -1,17 +1,80 @@
-def generator(n: int, p: float) -> list[tuple[int,int,int]]:
+import sys
+
+import numpy as np
+
+import _graphs_path # puts graphs/ on sys.path, for the imports below
+from graph_loader import save_binary_batches
+
+
+def pairs_from_indices(t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    the pairs (i, j) with i < j are numbered column by column: (0, 1), (0, 2), (1, 2), (0, 3), (1, 3), (2, 3), ...
+    so pair t has j(j - 1) / 2 <= t < j(j + 1) / 2 and i = t - j(j - 1) / 2
+    """
+    j = ((1 + np.sqrt(1 + 8 * t.astype(np.float64))) / 2).astype(np.int64)
+    # the square root is in floating point, so j can be off by one for huge t
+    j -= (j * (j - 1) // 2 > t)
+    j += ((j + 1) * j // 2 <= t)
+    return t - j * (j - 1) // 2, j
+
+
+def generate_batches(n: int, p: float, seed: int | None = None, max_weight: int = 10**6, batch_size: int = 1 << 20):
+    """
+    yields the edges of the graph as batches (a, b, w) of arrays, with a < b and weights from 1 to max_weight
+
+    geometric skip sampling: instead of flipping a coin for each of the n(n-1)/2 pairs, the gap between two
+    included pairs is drawn directly (it follows a geometric distribution with parameter p),
+    so the time is proportional to the number of edges and not to the number of pairs
+    """
+    assert n >= 1, 'the number of nodes should be at least 1'
+    assert 0 < p <= 1, 'the density shoud be in the interval (0, 1]'
+
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) // 2
+    last = -1 # the index of the last included pair
+    while last < total - 1:
+        # about as many gaps as edges are left (plus some slack), so small graphs don't draw a whole batch
+        size = min(batch_size, int((total - 1 - last) * p * 1.1) + 16)
+        t = last + np.cumsum(rng.geometric(p, size=size))
+        t = t[t < total]
+        if len(t) == 0:
+            break
+        last = int(t[-1])
+        a, b = pairs_from_indices(t)
+        yield a, b, rng.integers(1, max_weight + 1, size=len(t))
+        if len(t) < size: # the gaps went past the last pair
+            break
+
+
+def generator_arrays(n: int, p: float, seed: int | None = None, max_weight: int = 10**6) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    the whole graph as three arrays a, b, w (see generate_batches)
+    """
+    batches = list(generate_batches(n, p, seed, max_weight))
+    if len(batches) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    a, b, w = (np.concatenate(column) for column in zip(*batches))
+    return a, b, w
+
+
+def generator_to_file(path: str, n: int, p: float, seed: int | None = None, max_weight: int = 10**6) -> int:
+    """
+    streams the edges straight into a raw int32 file (read it back with graph_loader.load_edge_arrays)
+    return: the number of edges
+    """
+    return save_binary_batches(path, n, generate_batches(n, p, seed, max_weight))
+
+
+def generator(n: int, p: float, seed: int | None = None, max_weight: int = 10**6) -> list[tuple[int,int,int]]:
     """
     n: number of nodes
     p: probability of inserting an edge
-    
+    seed: the seed of the random generator (the same seed always gives the same graph)
+    max_weight: the weights are random integers from 1 to max_weight
+
     algorithm:
-        considers all n*(n-1)/2 and decides for each edge, with probability p
-            whether to include it or not
-        that means, for every edge:
-            - generate a random number $t$ from 0 to 1,
-            - if t < p, then include the edge
-            - otherwise, exclude it
+        includes each of the n*(n-1)/2 pairs with probability p,
+        but it jumps from one included pair to the next (see generate_batches), so it takes O(n + m) time
     """
-    assert n >= 1, 'the number of nodes should be at least 1'
-    assert 0 < p <= 1, 'the density shoud be in the interval (0, 1]'
-    
-    raise NotImplementedError()
+    a, b, w = generator_arrays(n, p, seed, max_weight)
+    return list(zip(a.tolist(), b.tolist(), w.tolist()))
@@ -1,4 +1,7 @@
-import heapq
+import sys
+
+import _graphs_path # puts graphs/ on sys.path, for the imports below
+from mst import edge_arrays, prim_arrays # the shared implementation, see graphs/mst.py
 
 def prim_n2(n: int, edges_list: list[tuple[int,int,int]]) -> list[int]:
     """
@@ -13,9 +16,10 @@ def prim_n2(n: int, edges_list: list[tuple[int,int,int]]) -> list[int]:
         be sure to use the original indices and not the ones of the sorted list
         
     algorithm: Prim's algorithm without priority queue, in O(n^2) time
+        (over a dense weight matrix, every step is vectorized with NumPy)
     """
-    
-    raise NotImplementedError()
+    a, b, w = edge_arrays(edges_list)
+    return prim_arrays(n, a, b, w, 'dense').tolist()
 
 
 def prim_mlogn(n: int, edges_list: list[tuple[int,int,int]]) -> list[int]:
@@ -31,7 +35,17 @@ def prim_mlogn(n: int, edges_list: list[tuple[int,int,int]]) -> list[int]:
         be sure to use the original indices and not the ones of the sorted list
         
     algorithm: Prim's algorithm with priority queue, in O(m \log n) time
+        (over a CSR graph, with an indexed heap with decrease-key)
     """
-    
-    raise NotImplementedError()
+    a, b, w = edge_arrays(edges_list)
+    return prim_arrays(n, a, b, w, 'heap').tolist()
+
+
+def prim(n: int, edges_list: list[tuple[int,int,int]]) -> list[int]:
+    """
+    same as prim_n2 and prim_mlogn, it picks the faster one for the density of the graph:
+    prim_n2 for dense graphs and prim_mlogn for sparse ones (see dense_cutover in graphs/mst.py)
+    """
+    a, b, w = edge_arrays(edges_list)
+    return prim_arrays(n, a, b, w).tolist()
 
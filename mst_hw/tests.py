@@ -1,16 +1,38 @@
+from random import randint, uniform
+
+from tqdm import tqdm
+
 from generator import generator
 from validator import validate_mst
-from prim import prim_n2, prim_mlogn
+from prim import prim, prim_n2, prim_mlogn
 from kruskal import kruskal
+from boruvka import boruvka
 
 def main():
-    # This function should stress test all implemented algorithms
+    # stress test of all implemented algorithms
     # repeat many times...
     # 1. generate a random graph
     # 2. run kruskal and prim
     # 3. validate the results
     # 4. if the validator returns false, raise an assertion
-    pass 
+    algorithms = {
+        'kruskal': kruskal,
+        'filter-kruskal': lambda n, edges_list: kruskal(n, edges_list, method='filter'),
+        'prim_n2': prim_n2,
+        'prim_mlogn': prim_mlogn,
+        'prim': prim,
+        'boruvka': boruvka,
+    }
+    for seed in tqdm(range(1000)):
+        n = randint(1, 60)
+        edges_list = generator(n, uniform(0.05, 1), seed=seed, max_weight=randint(1, 20)) # small weights, many ties
+        if len(kruskal(n, edges_list, forest=True)) < n - 1: # not connected, so there is no spanning tree
+            continue
+        for name, algorithm in algorithms.items():
+            mst = algorithm(n, edges_list)
+            if not validate_mst(n, edges_list, mst):
+                raise AssertionError(f'{name} is wrong on n = {n}, edges_list = {edges_list}: {mst}')
+    print("All correct!")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,9 @@
+import sys
+
+import _graphs_path # puts graphs/ on sys.path, for the imports below
+from mst import edge_arrays, validate_mst_arrays # the shared implementation, see graphs/mst.py
+
+
 def validate_mst(n: int, edges_list: list[tuple[int,int,int]], mst_edges_idx: list[int]) -> bool:
     """
     n: number of nodes
@@ -12,7 +18,8 @@ def validate_mst(n: int, edges_list: list[tuple[int,int,int]], mst_edges_idx: li
     """
     
     # step 1. validate that the indices in mst_edges_idx are from 0 to len(edges_list) - 1
-    # step 2. validate that mst_edges_idx is a tree (...)
-    # step 3. validate that it is a MST (each edge is optimal)
-    
-    raise NotImplementedError()
\ No newline at end of file
+    # step 2. validate that mst_edges_idx is a tree (n - 1 edges without cycles, checked with the Disjoint Sets)
+    # step 3. validate that it is a MST (each edge out of the tree is at least as heavy as the
+    #         heaviest edge on the tree path between its endpoints, found with binary lifting)
+    a, b, w = edge_arrays(edges_list)
+    return validate_mst_arrays(n, a, b, w, mst_edges_idx)